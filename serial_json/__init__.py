@@ -1,8 +1,46 @@
 from serial_json.interface import Serializer, register, unregister, get_serializer, \
     base_create_object, RegisterMetaclass, \
-    dumps, dump, loads, load, default, object_hook
+    get_context, get_option, serial_context, out_of_band, get_buffer, write_buffers, read_buffers, \
+    stream_value, iterencode, dumps, dump, is_tagged, loads, load, default, object_hook, \
+    to_builtins, from_builtins, update_state, loads_into
 
 from .dataclasses import MISSING, field, field_property, DataclassMeta, DataClass, dataclass, Message
+from .store import RecordStore
+from .mmap_reader import JsonLinesFile
+from .cache import CachedLoader
+
+
+def analyze(obj, **kwargs):
+    """Return a breakdown of the encoded size of the object (see serial_json.analyzer.analyze)."""
+    # Imported on use, so "python -m serial_json.analyzer" does not import the module twice
+    from .analyzer import analyze
+    return analyze(obj, **kwargs)
+
+
+# The parallel module is imported on use, since multiprocessing adds to the import time of serial_json
+def export_registry(strict=False):
+    """Return a picklable spec of the registered serializers (see serial_json.parallel.export_registry)."""
+    from .parallel import export_registry
+    return export_registry(strict=strict)
+
+
+def load_registry(spec):
+    """Register the serializers from a spec made by export_registry (see serial_json.parallel.load_registry)."""
+    from .parallel import load_registry
+    return load_registry(spec)
+
+
+def pool_initializer(spec=None, lazy=False):
+    """Return the process pool initializer keyword arguments (see serial_json.parallel.pool_initializer)."""
+    from .parallel import pool_initializer
+    return pool_initializer(spec=spec, lazy=lazy)
+
+
+def load_lines(path, **kwargs):
+    """Decode a JSON lines file in parallel worker processes (see serial_json.parallel.load_lines)."""
+    from .parallel import load_lines
+    return load_lines(path, **kwargs)
+
 
 try:
     import serial_json.bytes_support
@@ -20,6 +58,9 @@ try:
     str_date = serial_json.datetime_support.str_date
     str_time = serial_json.datetime_support.str_time
     str_datetime = serial_json.datetime_support.str_datetime
+    set_parse_cache = serial_json.datetime_support.set_parse_cache
+    clear_parse_cache = serial_json.datetime_support.clear_parse_cache
+    parse_cache_info = serial_json.datetime_support.parse_cache_info
 
     date_property = serial_json.datetime_support.date_property
     time_property = serial_json.datetime_support.time_property
@@ -40,6 +81,9 @@ except (ImportError, Exception):
     str_date = make_date
     str_time = make_date
     str_datetime = make_date
+    set_parse_cache = make_date
+    clear_parse_cache = make_date
+    parse_cache_info = make_date
 
     date_property = make_date
     time_property = make_date
@@ -0,0 +1,182 @@
+"""Payload size breakdown.
+
+Run on a sample file with:
+
+    python -m serial_json.analyzer sample.json
+"""
+import sys
+import json
+import argparse
+from serial_json.interface import to_builtins, get_serializer, dumps, loads, SERIALIZER_TYPE, SERIALIZER_OBJ
+
+
+__all__ = ['analyze', 'merge_reports', 'format_report', 'main']
+
+
+class _Stats(object):
+    def __init__(self, ensure_ascii=True):
+        self.ensure_ascii = ensure_ascii
+        self.tags = 0
+        self.escaping = 0
+        self.serializers = {}
+        self.fields = {}
+
+    def string_size(self, text):
+        """Return the encoded size of a string and add the escaping overhead."""
+        raw = len(text.encode('utf-8', 'surrogatepass'))
+        size = len(json.dumps(text, ensure_ascii=self.ensure_ascii).encode('utf-8', 'surrogatepass'))
+        self.escaping += size - raw - 2
+        return size
+
+    def key_size(self, key):
+        if not isinstance(key, str):
+            key = next(iter(json.loads(json.dumps({key: 0}))))  # Keys are converted to strings like json.dumps
+        return self.string_size(key)
+
+    def size(self, node):
+        """Return the compact encoded size of the builtins node and the size of its tagged descendants."""
+        if isinstance(node, str):
+            return self.string_size(node), 0
+        elif isinstance(node, dict):
+            return self.dict_size(node)
+        elif isinstance(node, list):
+            total = 2 + max(len(node) - 1, 0)  # Brackets and commas
+            tagged = 0
+            for item in node:
+                size, sub = self.size(item)
+                total += size
+                tagged += sub
+            return total, tagged
+        return len(json.dumps(node)), 0
+
+    def dict_size(self, node):
+        total = 2 + max(len(node) - 1, 0)  # Braces and commas
+        tagged = 0
+        items = {}
+        for key, value in node.items():
+            size, sub = self.size(value)
+            items[key] = item_size = self.key_size(key) + 1 + size  # Key, colon, value
+            total += item_size
+            tagged += sub
+
+        name = node.get(SERIALIZER_TYPE, None)
+        if not isinstance(name, str):
+            return total, tagged
+
+        # Tag overhead is everything except the wrapped value or the state items
+        if SERIALIZER_OBJ in node and len(node) == 2:
+            self.tags += total - (items[SERIALIZER_OBJ] - len(json.dumps(SERIALIZER_OBJ)) - 1)
+        else:
+            self.tags += items[SERIALIZER_TYPE] + (1 if len(node) > 1 else 0)
+
+        stats = self.serializers.setdefault(name, {'count': 0, 'bytes': 0, 'self_bytes': 0})
+        stats['count'] += 1
+        stats['bytes'] += total
+        stats['self_bytes'] += total - tagged
+
+        # DataClass fields
+        ser = get_serializer(name)
+        fields = getattr(getattr(ser, 'cls', None), '__fields__', None)
+        if fields is not None:
+            cls_name = ser.cls.__name__
+            for key, size in items.items():
+                if key in fields:
+                    field_name = '{}.{}'.format(cls_name, key)
+                    self.fields[field_name] = self.fields.get(field_name, 0) + size
+
+        return total, total
+
+
+def analyze(obj, **kwargs):
+    """Return a breakdown of the encoded size of the object in bytes.
+
+    Args:
+        obj (object): Object to encode through the registered serializers.
+        **kwargs (dict): Keyword arguments for dumps (indent, separators, ensure_ascii).
+
+    Returns:
+        report (dict): Dictionary with the
+            'total' encoded size,
+            'compact' size without whitespace,
+            'whitespace' bytes from the separators and indent,
+            'tags' bytes of the SERIALIZER_TYPE tags and SERIALIZER_OBJ wrappers,
+            'escaping' bytes added by escaping strings (\\u00XX for latin1 bytes and non ascii text),
+            'serializers' dictionary of serializer_name: {'count', 'bytes', 'self_bytes'} where self_bytes excludes
+            nested tagged objects,
+            'fields' dictionary of 'DataClass.field': bytes including the key and colon.
+    """
+    total = len(dumps(obj, **kwargs).encode('utf-8', 'surrogatepass'))
+    stats = _Stats(ensure_ascii=kwargs.get('ensure_ascii', True))
+    compact, _ = stats.size(to_builtins(obj))
+    return {'total': total, 'compact': compact, 'whitespace': total - compact,
+            'tags': stats.tags, 'escaping': stats.escaping,
+            'serializers': stats.serializers, 'fields': stats.fields}
+
+
+def merge_reports(reports):
+    """Return the sum of several analyze reports (for JSON lines)."""
+    merged = {'total': 0, 'compact': 0, 'whitespace': 0, 'tags': 0, 'escaping': 0, 'serializers': {}, 'fields': {}}
+    for report in reports:
+        for key in ('total', 'compact', 'whitespace', 'tags', 'escaping'):
+            merged[key] += report[key]
+        for name, stats in report['serializers'].items():
+            m = merged['serializers'].setdefault(name, {'count': 0, 'bytes': 0, 'self_bytes': 0})
+            for key in m:
+                m[key] += stats[key]
+        for name, size in report['fields'].items():
+            merged['fields'][name] = merged['fields'].get(name, 0) + size
+    return merged
+
+
+def format_report(report):
+    """Return the report as a readable table."""
+    total = max(report['total'], 1)
+
+    def line(name, size):
+        return '  {:<40} {:>12} {:>7.1%}'.format(name, size, size / total)
+
+    lines = ['Total: {} bytes'.format(report['total']),
+             line('whitespace', report['whitespace']),
+             line('tags', report['tags']),
+             line('escaping', report['escaping'])]
+
+    if report['serializers']:
+        lines.append('Serializers (self bytes, count):')
+        for name, stats in sorted(report['serializers'].items(), key=lambda item: -item[1]['self_bytes']):
+            lines.append(line(name, stats['self_bytes']) + ' {:>8}'.format(stats['count']))
+
+    if report['fields']:
+        lines.append('DataClass fields:')
+        for name, size in sorted(report['fields'].items(), key=lambda item: -item[1]):
+            lines.append(line(name, size))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m serial_json.analyzer',
+                                     description='Show what makes up the encoded size of a sample JSON file.')
+    parser.add_argument('filename', type=str, help='Sample JSON file')
+    parser.add_argument('--lines', action='store_true', help='The file is JSON lines')
+    parser.add_argument('--indent', type=int, default=None, help='Indent used to encode the sample')
+    parser.add_argument('--no-ensure-ascii', dest='ensure_ascii', action='store_false',
+                        help='Write non ascii characters as is instead of escaping them')
+    parser.add_argument('--import', dest='modules', action='append', default=[],
+                        help='Module to import that registers serializers (may be repeated)')
+    args = parser.parse_args(argv)
+
+    for module in args.modules:
+        __import__(module)
+
+    kwargs = {'indent': args.indent, 'ensure_ascii': args.ensure_ascii}
+    with open(args.filename, 'rb') as f:
+        if args.lines:
+            report = merge_reports(analyze(loads(line), **kwargs) for line in f if line.strip())
+        else:
+            report = analyze(loads(f.read()), **kwargs)
+
+    print(format_report(report))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,12 +1,415 @@
-from serial_json.interface import register
+import sys
+import zlib
+import array
+import base64
+import codecs
+import binascii
+from serial_json.interface import register, get_context, out_of_band, get_buffer, SERIALIZER_OBJ, SERIALIZER_TYPE
+
+
+__all__ = ['BINARY_ENCODING', 'BINARY_ENCODINGS', 'get_binary_encoding', 'set_binary_encoding',
+           'encode_binary', 'decode_binary', 'bytes_to_str', 'bytes_from_str',
+           'COMPRESSORS', 'DECOMPRESSORS_INTO', 'COMPRESSION', 'COMPRESSION_THRESHOLD', 'get_compression', 'set_compression',
+           'get_compressed_encoding', 'compress_binary', 'decompress_binary', 'decompress_into', 'encode_compressed',
+           'as_buffer', 'decode_into',
+           'bytes_encode', 'bytes_decode', 'bytearray_decode', 'memoryview_decode', 'array_encode', 'array_decode']
 
 
 def bytes_to_str(bts):
-    return bts.decode('latin1')
+    return codecs.latin_1_decode(bts)[0]
 
 
 def bytes_from_str(bts):
     return bts.encode('latin1')
 
 
-register(bytes, bytes_to_str, bytes_from_str)
+def base64_to_str(bts):
+    return binascii.b2a_base64(bts, newline=False).decode('ascii')
+
+
+def base64_from_str(text):
+    return binascii.a2b_base64(text)
+
+
+def base85_to_str(bts):
+    return base64.b85encode(bts).decode('ascii')
+
+
+def base85_from_str(text):
+    return base64.b85decode(text)
+
+
+def hex_to_str(bts):
+    return binascii.hexlify(bts).decode('ascii')
+
+
+def hex_from_str(text):
+    return binascii.unhexlify(text)
+
+
+# Encoding name: (encode function, decode function)
+BINARY_ENCODINGS = {
+    'latin1': (bytes_to_str, bytes_from_str),
+    'base64': (base64_to_str, base64_from_str),
+    'base85': (base85_to_str, base85_from_str),
+    'hex': (hex_to_str, hex_from_str),
+    }
+
+# latin1 keeps the original wire format (a plain string) which ensure_ascii escapes to 6 characters per byte >= 0x80
+BINARY_ENCODING = 'latin1'
+
+
+def get_binary_encoding(ctx=None):
+    """Return the name of the encoding used to serialize binary data.
+
+    The 'binary_encoding' option of serial_context overrides the global setting.
+
+    Args:
+        ctx (dict)[None]: Context options from get_context. If None the current options are looked up.
+    """
+    if ctx is None:
+        ctx = get_context()
+    return ctx.get('binary_encoding', BINARY_ENCODING)
+
+
+def set_binary_encoding(encoding='latin1'):
+    """Set the encoding used to serialize bytes, bytearray, memoryview, and numpy array data.
+
+    Args:
+        encoding (str)['latin1']: Name of the encoding in BINARY_ENCODINGS ('latin1', 'base64', 'base85', 'hex').
+    """
+    global BINARY_ENCODING
+    if encoding not in BINARY_ENCODINGS:
+        raise ValueError('Invalid binary encoding {}. Allowed encodings are {}'.format(
+                         repr(encoding), repr(list(BINARY_ENCODINGS))))
+    BINARY_ENCODING = encoding
+
+
+def encode_binary(bts, encoding=None):
+    """Return the binary data (bytes or buffer) as a string.
+
+    Args:
+        bts (bytes/bytearray/memoryview): Binary data to encode.
+        encoding (str)[None]: Name of the encoding. If None the current binary encoding is used.
+
+    Returns:
+        text (str): Encoded string.
+    """
+    if encoding is None:
+        encoding = get_binary_encoding()
+    return BINARY_ENCODINGS[encoding][0](bts)
+
+
+def decode_binary(text, encoding=None):
+    """Return the bytes for the encoded string.
+
+    Args:
+        text (str): Encoded string.
+        encoding (str)[None]: Name of the encoding. If None 'latin1' is used for legacy data.
+
+    Returns:
+        bts (bytes): Decoded bytes.
+    """
+    if encoding is None:
+        encoding = 'latin1'
+    return BINARY_ENCODINGS[encoding][1](text)
+
+
+# ========== Compression ==========
+def zlib_decompress(data, size=None):
+    if size:
+        return zlib.decompress(data, bufsize=size)  # Preallocate the output buffer
+    return zlib.decompress(data)
+
+
+# Compression name: (compress function, decompress function(data, size))
+COMPRESSORS = {
+    'zlib': (zlib.compress, zlib_decompress),
+    }
+
+DECOMPRESS_CHUNK_SIZE = 1 << 20  # Largest temporary chunk that decompress_into holds at once
+
+
+def _write_chunk(view, nbytes, chunk):
+    """Copy the chunk into the view at nbytes and return the new number of bytes written."""
+    end = nbytes + len(chunk)
+    if end > view.nbytes:
+        raise ValueError('The output buffer is too small ({} bytes) for the decompressed data'.format(view.nbytes))
+    view[nbytes: end] = chunk
+    return end
+
+
+def _input_chunks(data):
+    """Yield the compressed data in slices, so the decompressors never copy the remaining input."""
+    data = memoryview(data).cast('B')
+    for i in range(0, len(data), DECOMPRESS_CHUNK_SIZE):
+        yield data[i: i + DECOMPRESS_CHUNK_SIZE]
+
+
+def zlib_decompress_into(data, view):
+    d = zlib.decompressobj()
+    nbytes = 0
+    for chunk in _input_chunks(data):
+        while chunk and not d.eof:
+            nbytes = _write_chunk(view, nbytes, d.decompress(chunk, DECOMPRESS_CHUNK_SIZE))
+            chunk = d.unconsumed_tail
+    return _write_chunk(view, nbytes, d.flush())
+
+
+def stream_decompress_into(decompressor, data, view):
+    """Decompress in chunks with a lzma or bz2 style decompressor object and return the number of bytes."""
+    nbytes = 0
+    for chunk in _input_chunks(data):
+        if decompressor.eof:
+            break
+        nbytes = _write_chunk(view, nbytes, decompressor.decompress(chunk, DECOMPRESS_CHUNK_SIZE))
+        while not decompressor.eof and not decompressor.needs_input:
+            nbytes = _write_chunk(view, nbytes, decompressor.decompress(b'', DECOMPRESS_CHUNK_SIZE))
+    return nbytes
+
+
+# Compression name: decompress function(data, view) that writes into a writable byte memoryview and returns nbytes
+DECOMPRESSORS_INTO = {
+    'zlib': zlib_decompress_into,
+    }
+
+try:
+    import lzma
+    COMPRESSORS['lzma'] = (lzma.compress, lambda data, size=None: lzma.decompress(data))
+    DECOMPRESSORS_INTO['lzma'] = lambda data, view: stream_decompress_into(lzma.LZMADecompressor(), data, view)
+except (ImportError, Exception):
+    pass
+
+try:
+    import bz2
+    COMPRESSORS['bz2'] = (bz2.compress, lambda data, size=None: bz2.decompress(data))
+    DECOMPRESSORS_INTO['bz2'] = lambda data, view: stream_decompress_into(bz2.BZ2Decompressor(), data, view)
+except (ImportError, Exception):
+    pass
+
+COMPRESSION = None  # Name of the compressor or None to disable compression
+COMPRESSION_THRESHOLD = 64 * 1024  # Only compress binary data that is at least this many bytes
+
+
+def get_compression(nbytes, ctx=None):
+    """Return the compression name to use for binary data of the given size or None.
+
+    The 'compression' and 'compression_threshold' options of serial_context override the global settings.
+
+    Args:
+        nbytes (int): Size of the binary data.
+        ctx (dict)[None]: Context options from get_context. If None the current options are looked up.
+    """
+    if ctx is None:
+        ctx = get_context()
+    compression = ctx.get('compression', COMPRESSION)
+    if compression is None or nbytes < ctx.get('compression_threshold', COMPRESSION_THRESHOLD):
+        return None
+    return compression
+
+
+def set_compression(compression=None, threshold=None):
+    """Set the compression for large bytes, bytearray, memoryview, and numpy array data.
+
+    Args:
+        compression (str)[None]: Name of the compressor in COMPRESSORS ('zlib', 'lzma', 'bz2') or None to disable.
+        threshold (int)[None]: Only compress data with at least this many bytes. None keeps the current threshold.
+    """
+    global COMPRESSION, COMPRESSION_THRESHOLD
+    if compression is not None and compression not in COMPRESSORS:
+        raise ValueError('Invalid compression {}. Allowed compressions are {}'.format(
+                         repr(compression), repr(list(COMPRESSORS))))
+    COMPRESSION = compression
+    if threshold is not None:
+        COMPRESSION_THRESHOLD = threshold
+
+
+def compress_binary(bts, compression):
+    """Return the compressed bytes."""
+    return COMPRESSORS[compression][0](bts)
+
+
+def get_compressed_encoding(ctx=None):
+    """Return the encoding for compressed data.
+
+    Compressed bytes are mostly >= 0x80, which latin1 (and ensure_ascii) would escape to 6 characters per byte, so
+    compressed data always uses base85 if it is the current binary encoding or base64 otherwise.
+    """
+    encoding = get_binary_encoding(ctx)
+    if encoding not in ('base64', 'base85'):
+        encoding = 'base64'
+    return encoding
+
+
+def encode_compressed(buf, compression, ctx=None):
+    """Return the dictionary items for the compressed data or None if compressing does not make the data smaller.
+
+    Args:
+        buf (bytes/memoryview): Data to compress.
+        compression (str): Name of the compressor.
+        ctx (dict)[None]: Context options from get_context. If None the current options are looked up.
+
+    Returns:
+        d (dict/None): Dictionary with the 'encoding', 'data', 'compression', and 'size' or None.
+    """
+    compressed = compress_binary(buf, compression)
+    size = memoryview(buf).nbytes
+    if len(compressed) >= size:
+        return None
+    encoding = get_compressed_encoding(ctx)
+    return {'encoding': encoding, 'data': encode_binary(compressed, encoding), 'compression': compression,
+            'size': size}
+
+
+def decompress_binary(bts, compression, size=None):
+    """Return the decompressed bytes.
+
+    Args:
+        bts (bytes): Compressed data.
+        compression (str): Name of the compressor.
+        size (int)[None]: Original size which is used to preallocate the output buffer if the compressor allows it.
+    """
+    return COMPRESSORS[compression][1](bts, size)
+
+
+def decompress_into(bts, compression, out):
+    """Decompress the data straight into a preallocated writable buffer.
+
+    The data is decompressed in chunks of at most DECOMPRESS_CHUNK_SIZE bytes, so the full decompressed data is never
+    held in a temporary bytes object. Compressors without an incremental decompressor are decompressed with
+    decompress_binary and copied.
+
+    Args:
+        bts (bytes): Compressed data.
+        compression (str): Name of the compressor.
+        out (bytearray/memoryview/np.ndarray/object): Writable buffer that is large enough to hold the data.
+
+    Returns:
+        nbytes (int): Number of bytes written to the start of the buffer.
+
+    Raises:
+        ValueError: If the output buffer is too small.
+    """
+    view = memoryview(out).cast('B')
+    try:
+        decompress = DECOMPRESSORS_INTO[compression]
+    except KeyError:
+        return _write_chunk(view, 0, decompress_binary(bts, compression, view.nbytes))
+    return decompress(bts, view)
+
+
+def as_buffer(obj):
+    """Return a contiguous unsigned byte memoryview for a bytes like object."""
+    view = memoryview(obj)
+    if not view.c_contiguous:
+        return view.tobytes()
+    elif view.format != 'B' or view.ndim != 1:
+        return view.cast('B')
+    return view
+
+
+def bytes_encode(obj):
+    """Encode a bytes like object as a string (legacy latin1), a dictionary with the encoding name, or an out of
+    band buffer reference.
+    """
+    ctx = get_context()  # Look up the options once
+    buf = obj if type(obj) is bytes else as_buffer(obj)
+    if ctx.get('buffer_callback', None) is not None:
+        index = out_of_band(as_buffer(buf), ctx)
+        if index is not None:
+            return {'buffer': index}
+
+    compression = get_compression(len(buf), ctx)
+    if compression is not None:
+        d = encode_compressed(buf, compression, ctx)
+        if d is not None:
+            return d
+
+    encoding = get_binary_encoding(ctx)
+    if encoding == 'latin1':
+        return bytes_to_str(buf)
+    return {'encoding': encoding, 'data': encode_binary(buf, encoding)}
+
+
+def _decode_buffer(obj):
+    """Return the decoded bytes or the out of band buffer."""
+    if isinstance(obj, dict):
+        if 'buffer' in obj:
+            return get_buffer(obj['buffer'])
+        bts = decode_binary(obj.get('data', ''), obj.get('encoding', None))
+        if obj.get('compression', None) is not None:
+            bts = decompress_binary(bts, obj['compression'], obj.get('size', None))
+        return bts
+    return bytes_from_str(obj)
+
+
+def bytes_decode(obj):
+    """Decode a string (legacy latin1), encoding dictionary, or out of band buffer reference to bytes."""
+    buf = _decode_buffer(obj)
+    if not isinstance(buf, bytes):
+        buf = bytes(buf)
+    return buf
+
+
+def decode_into(obj, out):
+    """Decode the serialized binary data and copy it into a preallocated writable buffer.
+
+    loads always creates new bytes objects. To fill an existing buffer decode the text with loads(s, tagged=False)
+    and pass the undecoded bytes value to this function. Out of band buffers are copied straight into the output
+    buffer and compressed data is decompressed straight into it. Other data is decoded to a temporary bytes object
+    first, since the binary encodings cannot write into an existing buffer.
+
+    Args:
+        obj (str/dict): Serialized binary data (the value from bytes_encode or the tagged bytes dictionary).
+        out (bytearray/memoryview/array.array/object): Writable buffer that is large enough to hold the data.
+
+    Returns:
+        nbytes (int): Number of bytes written to the start of the buffer.
+    """
+    if isinstance(obj, dict) and SERIALIZER_TYPE in obj:
+        obj = obj.get(SERIALIZER_OBJ, obj)
+    if isinstance(obj, dict) and 'buffer' not in obj and obj.get('compression', None) is not None:
+        bts = decode_binary(obj.get('data', ''), obj.get('encoding', None))
+        return decompress_into(bts, obj['compression'], out)
+
+    buf = _decode_buffer(obj)
+    view = memoryview(out).cast('B')
+    nbytes = memoryview(buf).nbytes
+    if nbytes > view.nbytes:
+        raise ValueError('The output buffer is too small ({} bytes) for the decoded data ({} bytes)'.format(
+                         view.nbytes, nbytes))
+    view[:nbytes] = as_buffer(buf)
+    return nbytes
+
+
+def bytearray_decode(obj):
+    if isinstance(obj, str):
+        return bytearray(obj, 'latin1')  # Encode directly into the bytearray without an intermediate bytes object
+    return bytearray(_decode_buffer(obj))
+
+
+def memoryview_decode(obj):
+    return memoryview(_decode_buffer(obj))
+
+
+def array_encode(obj):
+    """Encode an array.array from its buffer with the typecode and byte order."""
+    return {'typecode': obj.typecode, 'itemsize': obj.itemsize, 'byteorder': sys.byteorder,
+            'data': bytes_encode(obj)}
+
+
+def array_decode(obj):
+    arr = array.array(obj['typecode'])
+    if arr.itemsize != obj.get('itemsize', arr.itemsize):
+        raise ValueError('The array typecode {} has an itemsize of {} on this platform instead of {}'.format(
+                         repr(obj['typecode']), arr.itemsize, obj['itemsize']))
+    arr.frombytes(_decode_buffer(obj.get('data', '')))
+    if obj.get('byteorder', sys.byteorder) != sys.byteorder:
+        arr.byteswap()
+    return arr
+
+
+register(bytes, bytes_encode, bytes_decode)
+register(bytearray, bytes_encode, bytearray_decode)
+register(memoryview, bytes_encode, memoryview_decode)
+register(array.array, array_encode, array_decode)
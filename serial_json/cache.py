@@ -0,0 +1,171 @@
+import copy
+import hashlib
+import datetime
+import threading
+from types import MappingProxyType
+from collections import OrderedDict
+from serial_json.interface import loads
+
+
+__all__ = ['POLICIES', 'IMMUTABLE_TYPES', 'payload_key', 'copy_result', 'freeze_result', 'CachedLoader']
+
+
+POLICIES = ('shared', 'copy')
+
+# Values that are returned as is when copying a cached result
+IMMUTABLE_TYPES = (str, int, float, bool, type(None), bytes, frozenset,
+                   datetime.date, datetime.time, datetime.datetime, datetime.timedelta)
+
+
+def payload_key(s):
+    """Return a 128 bit hash key for the JSON string or bytes."""
+    if isinstance(s, str):
+        s = s.encode('utf-8', 'surrogatepass')
+    return hashlib.blake2b(s, digest_size=16).digest()
+
+
+def copy_result(obj):
+    """Return a copy of a decoded result.
+
+    Dictionaries and lists are copied recursively, immutable values are shared, and any other object (custom
+    serialized classes) is deep copied.
+    """
+    if isinstance(obj, IMMUTABLE_TYPES):
+        return obj
+    elif type(obj) is dict:
+        return {k: copy_result(v) for k, v in obj.items()}
+    elif type(obj) is list:
+        return [copy_result(v) for v in obj]
+    return copy.deepcopy(obj)
+
+
+def freeze_result(obj):
+    """Return a read only version of a decoded result that can be shared between callers.
+
+    Dictionaries become MappingProxyType, lists become tuples, bytearrays become bytes, and numpy arrays are made
+    read only (in place), recursively. Any other object (custom serialized classes) is returned as is.
+    """
+    if isinstance(obj, IMMUTABLE_TYPES):
+        return obj
+    elif type(obj) is dict:
+        return MappingProxyType({k: freeze_result(v) for k, v in obj.items()})
+    elif type(obj) in (list, tuple):
+        return tuple(freeze_result(v) for v in obj)
+    elif type(obj) is bytearray:
+        return bytes(obj)
+    elif type(obj) is set:
+        return frozenset(obj)
+    elif hasattr(obj, 'setflags') and hasattr(obj, 'dtype'):
+        obj.setflags(write=False)  # numpy array owned by the cache
+    return obj
+
+
+class CachedLoader(object):
+    """Thread safe LRU cache of decoded JSON payloads.
+
+    Payloads are keyed by a hash of the input string or bytes, so repeated payloads skip the object_hook and
+    serializer decode. The cache is bounded by the number of entries and by the total size of the cached inputs.
+
+    Args:
+        maxsize (int)[1024]: Maximum number of cached payloads.
+        maxbytes (int)[64 MB]: Maximum total length of the cached inputs. Larger payloads are never cached.
+        policy (str)['copy']: 'shared' returns the same read only cached object every time (see freeze_result).
+            Dictionaries and lists are returned as MappingProxyType and tuples. Custom serialized objects are not
+            frozen and callers must not modify them. 'copy' returns a copy of the cached object (see copy_result).
+        **kwargs (dict): Keyword arguments for loads.
+    """
+    def __init__(self, maxsize=1024, maxbytes=64 * 1024 * 1024, policy='copy', **kwargs):
+        if policy not in POLICIES:
+            raise ValueError('Invalid policy {}. Allowed policies are {}'.format(repr(policy), repr(POLICIES)))
+
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.policy = policy
+        self.loads_kwargs = kwargs
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._cache = OrderedDict()  # key: (value, nbytes)
+        self._lock = threading.Lock()
+
+    def loads(self, s, **kwargs):
+        """Return the decoded object for the JSON string or bytes.
+
+        Keyword arguments (like buffers) change the result, so calls with keyword arguments bypass the cache.
+        """
+        if kwargs:
+            kw = dict(self.loads_kwargs)
+            kw.update(kwargs)
+            return loads(s, **kw)
+
+        key = payload_key(s)
+        with self._lock:
+            try:
+                value = self._cache[key][0]
+                self._cache.move_to_end(key)
+                self.hits += 1
+                hit = True
+            except KeyError:
+                self.misses += 1
+                hit = False
+
+        if not hit:
+            value = loads(s, **self.loads_kwargs)
+            if self.policy == 'shared':
+                value = freeze_result(value)
+            self._set(key, value, len(s))
+
+        if self.policy == 'copy':
+            return copy_result(value)
+        return value
+
+    __call__ = loads
+
+    def _set(self, key, value, nbytes):
+        if nbytes > self.maxbytes:
+            return
+
+        with self._lock:
+            old = self._cache.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[1]
+            self._cache[key] = (value, nbytes)
+            self.nbytes += nbytes
+            self._trim()
+
+    def set_maxsize(self, maxsize=None, maxbytes=None):
+        """Set the maximum number of entries and bytes and drop the least recently used payloads over the limits."""
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if maxbytes is not None:
+                self.maxbytes = maxbytes
+            self._trim()
+
+    def _trim(self):
+        while self._cache and (len(self._cache) > max(self.maxsize, 0) or self.nbytes > self.maxbytes):
+            self.nbytes -= self._cache.popitem(last=False)[1][1]
+
+    def clear(self):
+        """Remove all cached payloads and reset the statistics."""
+        with self._lock:
+            self._cache.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def hit_rate(self):
+        """Return the fraction of loads calls that were found in the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def info(self):
+        """Return a dictionary of the cache statistics."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hit_rate,
+                    'maxsize': self.maxsize, 'currsize': len(self._cache),
+                    'maxbytes': self.maxbytes, 'nbytes': self.nbytes, 'policy': self.policy}
+
+    def __len__(self):
+        return len(self._cache)
@@ -3,7 +3,7 @@ from inspect import signature, Signature, Parameter
 from typing import Any, Callable
 from collections import OrderedDict
 
-from .interface import register, dumps, loads
+from .interface import register, dumps, loads, from_builtins, update_state, loads_into, SERIALIZER_TYPE
 
 
 __all__ = ['MISSING', 'field', 'field_property', 'DataclassMeta', 'DataClass', 'dataclass', 'Message']
@@ -31,10 +31,12 @@ class field(object):
         skip_repr (object/Any)[MISSING]: Do not include this field in the __repr__ if the set value equals this value.
         name (str)[MISSING]: Field variable name. This is automatically set.
         type (object/type): Field type. Used in __init__ doc string and annotation.
+        encode_state (function)[None]: Function that converts the value for the serialized state (__getstate__).
+        decode_state (function)[None]: Function that converts the serialized state value back (__setstate__).
     """
     def __init__(self, default=MISSING, default_factory=MISSING, required=None, repr=True, hash=None, init=True,
                  compare=True, metadata=None, dict=True, skip_dict=MISSING, skip_repr=MISSING, name=MISSING, type=Any,
-                 doc='', **kwargs):
+                 doc='', encode_state=None, decode_state=None, **kwargs):
         super().__init__()
         self.__doc__ = doc
 
@@ -51,6 +53,8 @@ class field(object):
         self.skip_dict = skip_dict
         self.type = type
         self.name = name
+        self.encode_state = encode_state
+        self.decode_state = decode_state
 
         if self.required is None:
             self.required = not self.has_default()
@@ -339,6 +343,10 @@ class DataclassMeta(type):
                 dct['json'] = mcs.json_func
             if 'from_json' not in nd:
                 dct['from_json'] = mcs.from_json_func
+            if '__update_state__' not in nd:
+                dct['__update_state__'] = mcs.update_state_func
+            if 'update_from_json' not in nd:
+                dct['update_from_json'] = mcs.update_from_json_func
 
         if nd.get('__hash__', object.__hash__) == object.__hash__:
             dct['__hash__'] = mcs.hash_func
@@ -351,6 +359,10 @@ class DataclassMeta(type):
 
         dct['__is_frozen__'] = frozen
 
+        # The default __setstate__ sets every field, so decode does not need to call a failing __init__
+        setstate = dct.get('__setstate__', nd.get('__setstate__', None))
+        dct['__init_on_decode__'] = setstate is not mcs.setstate_func
+
         return dct
 
     @staticmethod
@@ -435,9 +447,38 @@ class DataclassMeta(type):
                 if f.repr and f.skip_repr != getattr(self, f.name, MISSING)]
         return '{}({})'.format(self.__class__.__name__, ', '.join(args))
 
+    @staticmethod
+    def state_codecs(cls):
+        """Return the ({name: encode_state}, {name: decode_state}) functions of the class fields (cached)."""
+        try:
+            return cls.__dict__['__state_codecs__']
+        except KeyError:
+            fields = cls.__dict__.get('__fields__', None) or getattr(cls, '__fields__', {})
+            codecs = ({f.name: f.encode_state for f in fields.values() if getattr(f, 'encode_state', None)},
+                      {f.name: f.decode_state for f in fields.values() if getattr(f, 'decode_state', None)})
+            setattr(cls, '__state_codecs__', codecs)
+            return codecs
+
     @staticmethod
     def getstate_func(self):
-        return self.dict()
+        state = self.dict()
+        encoders = DataclassMeta.state_codecs(type(self))[0]
+        if encoders:
+            for k, encode in encoders.items():
+                if k in state:
+                    state[k] = encode(state[k])
+        return state
+
+    @staticmethod
+    def apply_decode_state(self, state):
+        """Return the state with the field decode_state functions applied."""
+        decoders = DataclassMeta.state_codecs(type(self))[1]
+        if decoders and any(k in state for k in decoders):
+            state = dict(state)
+            for k, decode in decoders.items():
+                if k in state:
+                    state[k] = decode(state[k])
+        return state
 
     @staticmethod
     def setstate_func(self, state):
@@ -449,9 +490,38 @@ class DataclassMeta(type):
                 setattr(self, f.name, f.get_default_value(self))
 
         # Set the given state values
+        for k, v in DataclassMeta.apply_decode_state(self, state).items():
+            setattr(self, k, v)
+
+    @staticmethod
+    def update_state_func(self, state):
+        # Subclasses with a custom __setstate__ decide how their state is set
+        if type(self).__setstate__ is not DataclassMeta.setstate_func:
+            self.__setstate__(from_builtins(state))
+            return
+
+        # Same as setstate_func, but nested objects of the same type are updated in place
+        for f in self.__fields__.values():
+            if f.has_default() and f.name not in state:
+                setattr(self, f.name, f.get_default_value(self))
+
         for k, v in state.items():
+            current = getattr(self, k, None)
+            if current is not None and type(v) is dict and SERIALIZER_TYPE in v:
+                v = update_state(current, v)
+                if v is current:
+                    continue  # Updated in place
+            else:
+                v = from_builtins(v)
+                decode = DataclassMeta.state_codecs(type(self))[1].get(k, None)
+                if decode is not None:
+                    v = decode(v)
             setattr(self, k, v)
 
+    @staticmethod
+    def update_from_json_func(self, text):
+        return loads_into(self, text)
+
     @staticmethod
     def json_func(self):
         return dumps(self)
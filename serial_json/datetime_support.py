@@ -1,4 +1,8 @@
+import re
+import calendar
 import datetime
+import threading
+from collections import OrderedDict
 from typing import Union, List
 from serial_json.interface import register
 from serial_json.dataclasses import MISSING, field_property
@@ -6,6 +10,8 @@ from serial_json.dataclasses import MISSING, field_property
 
 __all__ = ['DATE_FORMATS', 'TIME_FORMATS', 'DATETIME_FORMATS',
            'make_date', 'make_time', 'make_datetime', 'str_date', 'str_time', 'str_datetime',
+           'compile_format', 'strptime',
+           'ParseCache', 'PARSE_CACHE', 'set_parse_cache', 'clear_parse_cache', 'parse_cache_info',
            'date_property', 'time_property', 'datetime_property', 'timedelta_attr_property', 'seconds_property']
 
 
@@ -29,6 +35,275 @@ TIME_FORMATS = [
 DATETIME_FORMATS = [d + ' ' + t for t in TIME_FORMATS for d in DATE_FORMATS] + DATE_FORMATS + TIME_FORMATS
 
 
+# ========== Compiled Formats ==========
+def _names_re(name, values):
+    """Return a regex group that matches any of the given names (longest names first)."""
+    values = sorted((re.escape(v.lower()) for v in values if v), key=len, reverse=True)
+    return '(?P<{}>{})'.format(name, '|'.join(values))
+
+
+def _locale_names():
+    """Return the lowercase month name, month abbreviation, and am/pm mappings for the current locale."""
+    months = {name.lower(): i for i, name in enumerate(calendar.month_name) if name}
+    months_abbr = {name.lower(): i for i, name in enumerate(calendar.month_abbr) if name}
+    am_pm = {datetime.time(1).strftime('%p').lower(): 0, datetime.time(22).strftime('%p').lower(): 12}
+    return months, months_abbr, am_pm
+
+
+_MONTHS, _MONTHS_ABBR, _AM_PM = _locale_names()
+
+# Same regexes that the _strptime module uses for each directive
+_DIRECTIVES = {
+    'd': r'(?P<d>3[01]|[12]\d|0[1-9]|[1-9]| [1-9])',
+    'f': r'(?P<f>[0-9]{1,6})',
+    'H': r'(?P<H>2[0-3]|[0-1]\d|\d)',
+    'I': r'(?P<I>1[0-2]|0[1-9]|[1-9])',
+    'm': r'(?P<m>1[0-2]|0[1-9]|[1-9])',
+    'M': r'(?P<M>[0-5]\d|\d)',
+    'S': r'(?P<S>6[0-1]|[0-5]\d|\d)',
+    'y': r'(?P<y>\d\d)',
+    'Y': r'(?P<Y>\d\d\d\d)',
+    'b': _names_re('b', _MONTHS_ABBR),
+    'B': _names_re('B', _MONTHS),
+    'p': _names_re('p', _AM_PM),
+    'a': _names_re('a', calendar.day_abbr),
+    'A': _names_re('A', calendar.day_name),
+    }
+
+_COMPILED_FORMATS = {}
+
+
+def _convert_groups(found):
+    """Convert the regex group dictionary into a datetime the same way that strptime does."""
+    year = found.get('Y')
+    if year is not None:
+        year = int(year)
+    elif found.get('y') is not None:
+        year = int(found['y'])
+        year += 2000 if year <= 68 else 1900
+    else:
+        year = 1900
+
+    month = found.get('m')
+    if month is not None:
+        month = int(month)
+    elif found.get('b') is not None:
+        month = _MONTHS_ABBR[found['b'].lower()]
+    elif found.get('B') is not None:
+        month = _MONTHS[found['B'].lower()]
+    else:
+        month = 1
+
+    day = found.get('d')
+    day = int(day) if day is not None else 1
+
+    hour = found.get('H')
+    if hour is not None:
+        hour = int(hour)
+    elif found.get('I') is not None:
+        hour = int(found['I']) % 12
+        if found.get('p') is not None:
+            hour += _AM_PM[found['p'].lower()]
+    else:
+        hour = 0
+
+    minute = found.get('M')
+    second = found.get('S')
+    micro = found.get('f')
+    return datetime.datetime(year, month, day, hour,
+                             int(minute) if minute is not None else 0,
+                             int(second) if second is not None else 0,
+                             int(micro + '0' * (6 - len(micro))) if micro is not None else 0)
+
+
+def compile_format(fmt):
+    """Compile a strptime format into a lock free parser function.
+
+    datetime.strptime takes a module lock and rebuilds a struct_time on every call. The returned parser uses a
+    precompiled regex and int conversions instead. Formats with directives that are not supported fall back to
+    datetime.strptime.
+
+    Args:
+        fmt (str): strptime format string ('%Y-%m-%d').
+
+    Returns:
+        parse (function): Function that takes a string and returns a datetime.datetime or raises a ValueError.
+    """
+    try:
+        return _COMPILED_FORMATS[fmt]
+    except (KeyError, TypeError):
+        pass
+
+    try:
+        pattern = []
+        for i, part in enumerate(fmt.split('%')):
+            if i == 0:
+                literal = part
+            elif not part:
+                raise ValueError('Escaped % is not supported')
+            else:
+                pattern.append(_DIRECTIVES[part[0]])
+                literal = part[1:]
+            pattern.append(r'\s+'.join(re.escape(s) for s in re.split(r'\s+', literal)))
+        regex = re.compile(''.join(pattern), re.IGNORECASE)
+    except (KeyError, ValueError, TypeError, re.error, Exception):
+        def parse(date_string):
+            return datetime.datetime.strptime(date_string, fmt)
+    else:
+        def parse(date_string):
+            found = regex.match(date_string)
+            if found is None:
+                raise ValueError('time data {!r} does not match format {!r}'.format(date_string, fmt))
+            elif found.end() != len(date_string):
+                raise ValueError('unconverted data remains: {}'.format(date_string[found.end():]))
+            return _convert_groups(found.groupdict())
+
+    _COMPILED_FORMATS[fmt] = parse
+    return parse
+
+
+def strptime(date_string, fmt):
+    """Return a datetime from the string using the compiled parser for the format."""
+    return compile_format(fmt)(date_string)
+
+
+# Compile the default formats
+for _fmt in DATETIME_FORMATS:
+    compile_format(_fmt)
+
+
+# ========== Parse Cache ==========
+class ParseCache(object):
+    """Thread safe size bounded LRU cache of parsed date, time, and datetime strings.
+
+    Date, time, and datetime objects are immutable, so the same cached result can be shared by every caller.
+
+    Args:
+        maxsize (int)[1024]: Maximum number of parsed strings to keep.
+        enabled (bool)[True]: If False the cache is bypassed.
+    """
+    def __init__(self, maxsize=1024, enabled=True):
+        self.maxsize = maxsize
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the cached value for the key and mark it as recently used."""
+        with self._lock:
+            try:
+                value = self._cache[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Save the value for the key and drop the least recently used values over the maxsize."""
+        with self._lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            self._trim()
+
+    def set_maxsize(self, maxsize):
+        """Set the maximum number of cached values and drop the least recently used values over the maxsize."""
+        with self._lock:
+            self.maxsize = maxsize
+            self._trim()
+
+    def _trim(self):
+        while len(self._cache) > max(self.maxsize, 0):
+            self._cache.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached values and reset the statistics."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """Return a dictionary of the cache statistics."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'maxsize': self.maxsize,
+                    'currsize': len(self._cache), 'enabled': self.enabled}
+
+    def __len__(self):
+        return len(self._cache)
+
+
+PARSE_CACHE = ParseCache()
+
+
+def set_parse_cache(enabled=True, maxsize=None):
+    """Globally enable or disable the parse cache.
+
+    Args:
+        enabled (bool)[True]: If the make_date, make_time, and make_datetime functions should use the cache.
+        maxsize (int)[None]: New maximum number of cached strings. None keeps the current maxsize.
+    """
+    PARSE_CACHE.enabled = enabled
+    if maxsize is not None:
+        PARSE_CACHE.set_maxsize(maxsize)
+    if not enabled:
+        PARSE_CACHE.clear()
+
+
+def clear_parse_cache():
+    """Remove all cached parse results."""
+    PARSE_CACHE.clear()
+    _FORMATS_KEYS.clear()
+
+
+def parse_cache_info():
+    """Return the parse cache hits, misses, maxsize, currsize, and enabled values."""
+    return PARSE_CACHE.info()
+
+
+_FORMATS_KEYS = {}
+_FORMATS_KEYS_MAXSIZE = 64
+
+
+def _formats_key(formats):
+    """Return the hashable cache key for the list of formats.
+
+    The tuple is built once per list object, so the default DATETIME_FORMATS list is not copied and hashed again on
+    every cache hit. A list whose length changes gets a new key. Call clear_parse_cache after replacing items in place.
+    """
+    if type(formats) is tuple:
+        return formats
+
+    try:
+        lst, key = _FORMATS_KEYS[id(formats)]
+        if lst is formats and len(key) == len(formats):
+            return key
+    except KeyError:
+        pass
+
+    key = tuple(formats)
+    if len(_FORMATS_KEYS) >= _FORMATS_KEYS_MAXSIZE:
+        _FORMATS_KEYS.clear()
+    _FORMATS_KEYS[id(formats)] = (formats, key)  # Keep the list alive so the id is not reused
+    return key
+
+
+def _cached_parse(kind, value, formats, parse):
+    """Return the cached parse result for the string value or parse and cache it."""
+    if not PARSE_CACHE.enabled or not isinstance(value, str):
+        return parse(value, formats)
+
+    key = (kind, value, _formats_key(formats))
+    result = PARSE_CACHE.get(key)
+    if result is None:
+        result = parse(value, formats)
+        PARSE_CACHE.set(key, result)
+    return result
+
+
 def make_date(date_string, formats=None):
     """Make the date object from the given time string.
 
@@ -45,9 +320,13 @@ def make_date(date_string, formats=None):
     if formats is None:
         formats = DATETIME_FORMATS
 
+    return _cached_parse('date', date_string, formats, _parse_date)
+
+
+def _parse_date(date_string, formats):
     for fmt in formats:
         try:
-            dt = datetime.datetime.strptime(date_string, fmt)
+            dt = strptime(date_string, fmt)
             return dt.date()
         except (TypeError, ValueError, Exception):
             pass
@@ -76,9 +355,13 @@ def make_time(time_string, formats=None):
     if formats is None:
         formats = DATETIME_FORMATS
 
+    return _cached_parse('time', time_string, formats, _parse_time)
+
+
+def _parse_time(time_string, formats):
     for fmt in formats:
         try:
-            dt = datetime.datetime.strptime(time_string, fmt)
+            dt = strptime(time_string, fmt)
             return dt.time()
         except (TypeError, ValueError, Exception):
             pass
@@ -102,9 +385,13 @@ def make_datetime(date_string, formats=None):
     if formats is None:
         formats = DATETIME_FORMATS
 
+    return _cached_parse('datetime', date_string, formats, _parse_datetime)
+
+
+def _parse_datetime(date_string, formats):
     for fmt in formats:
         try:
-            return datetime.datetime.strptime(date_string, fmt)
+            return strptime(date_string, fmt)
         except (TypeError, ValueError, Exception):
             pass
 
@@ -1,11 +1,21 @@
+import os
+import re
+import uuid
 import inspect
+import threading
 import json
+import struct
 import functools
+import itertools
+import contextlib
+import contextvars
 
 
-__all__ = ['Serializer', 'register', 'unregister', 'get_serializer',
+__all__ = ['Serializer', 'Registry', 'register', 'unregister', 'get_serializer',
            'base_create_object', 'RegisterMetaclass',
-           'dumps', 'dump', 'loads', 'load', 'default', 'object_hook']
+           'get_context', 'get_option', 'serial_context', 'out_of_band', 'get_buffer', 'write_buffers', 'read_buffers',
+           'stream_value', 'iterencode', 'dumps', 'dump', 'is_tagged', 'loads', 'load', 'default', 'object_hook',
+           'get_builtins_plan', 'to_builtins', 'from_builtins', 'update_state', 'loads_into']
 
 
 def base_create_object(cls):
@@ -22,8 +32,22 @@ def base_create_object(cls):
     return obj
 
 
+def _create_call(cls):
+    return cls()
+
+
+def _create_new_init(cls):
+    obj = cls.__new__(cls)
+    obj.__init__()
+    return obj
+
+
+def _create_new(cls):
+    return cls.__new__(cls)
+
+
 # ========== Serializers ==========
-SERIALIZERS = []  # Serializer
+SERIALIZERS = ()  # Serializer tuple of the current registry snapshot
 SERIALIZER_TYPE = 'SERIALIZER_TYPE'
 SERIALIZER_OBJ = 'SERIALIZER_OBJ'
 
@@ -34,10 +58,15 @@ class Serializer(object):
     Encode functions should take in an object and return a dictionary
 
     Decode functions should take in a dictionary and return a new object from that objects data.
+
+    If tagged is False the encoded value is written as is without the SERIALIZER_TYPE. The encode function can add
+    the SERIALIZER_TYPE itself when the value needs to be decoded.
     """
-    def __init__(self, cls, encode=None, decode=None):
+    def __init__(self, cls, encode=None, decode=None, tagged=True):
         self.cls = cls
         self.serializer_name = getattr(cls, '__qualname__', '{}.{}'.format(cls.__module__, cls.__name__))
+        self.tagged = tagged
+        self._create = None  # Construction function learned by the first decode
 
         if encode is not None:
             self.encode = encode
@@ -48,19 +77,121 @@ class Serializer(object):
         return obj.__getstate__()
 
     def decode(self, obj):
+        create = self._create
+        if create is None:
+            new_obj = self.learn_create()
+        else:
+            try:
+                new_obj = create(self.cls)
+            except Exception:
+                new_obj = self.learn_create()
+
+        new_obj.__setstate__(obj)
+        return new_obj
+
+    def learn_create(self):
+        """Create a new object for decode and save the construction function that worked for this class.
+
+        The class is called without arguments if possible. Otherwise the object is created with "__new__" and
+        "__init__" is called without arguments. If "__init__" fails it is still called on every decode (ignoring the
+        error) unless the class sets "__init_on_decode__ = False" to say that "__setstate__" fully initializes an
+        object created with "__new__".
+        """
+        cls = self.cls
         try:
-            new_obj = self.cls()
+            new_obj = cls()
+            self._create = _create_call
+            return new_obj
         except Exception as err:
             try:
-                new_obj = base_create_object(self.cls)
+                new_obj = cls.__new__(cls)
             except (ValueError, TypeError, Exception):
                 raise err
 
-        new_obj.__setstate__(obj)
+        try:
+            new_obj.__init__()
+            self._create = _create_new_init
+        except (TypeError, Exception):
+            self._create = base_create_object if getattr(cls, '__init_on_decode__', True) else _create_new
         return new_obj
 
 
-def register(cls_obj=None, encode=None, decode=None):
+class Registry(object):
+    """Immutable snapshot of the registered serializers.
+
+    register and unregister build a new snapshot and swap it in with a single assignment, so readers never lock
+    and never see a partially updated registry.
+
+    Args:
+        serializers (tuple): Serializers in registration order.
+    """
+    __slots__ = ('serializers', 'by_class', 'by_name', 'subclass_cache', 'plans')
+
+    def __init__(self, serializers=()):
+        self.serializers = tuple(serializers)
+        self.by_class = {}
+        self.by_name = {}
+        for ser in self.serializers:
+            self.by_class.setdefault(ser.cls, ser)
+            self.by_name.setdefault(ser.serializer_name, ser)
+
+        # Class: first registered serializer of a base class or None. Filled on demand and only ever adds entries
+        # that are the same for every thread, so concurrent readers can share it.
+        self.subclass_cache = {}
+        self.plans = {}  # Class: to_builtins conversion function
+
+    def get(self, cls_obj):
+        """Return the serializer for the class or serializer name or None."""
+        if isinstance(cls_obj, str):
+            return self.by_name.get(cls_obj, None)
+
+        try:
+            return self.by_class[cls_obj]
+        except KeyError:
+            pass
+        except TypeError:
+            return None  # Unhashable
+
+        try:
+            return self.subclass_cache[cls_obj]
+        except KeyError:
+            pass
+
+        first_sub = None
+        for ser in self.serializers:
+            try:
+                if issubclass(cls_obj, ser.cls):
+                    first_sub = ser
+                    break
+            except (TypeError, ValueError, Exception):
+                pass
+
+        self.subclass_cache[cls_obj] = first_sub
+        return first_sub
+
+
+_REGISTRY = Registry()
+_REGISTRY_LOCK = threading.Lock()  # Only writers lock
+
+
+def _set_serializers(serializers):
+    """Swap in a new registry snapshot. Must be called with the _REGISTRY_LOCK."""
+    global SERIALIZERS, _REGISTRY
+    registry = Registry(serializers)
+    SERIALIZERS = registry.serializers
+    _REGISTRY = registry
+
+
+def _as_class(cls_obj):
+    try:
+        if not inspect.isclass(cls_obj):
+            cls_obj = cls_obj.__class__
+    except (AttributeError, Exception):
+        pass
+    return cls_obj
+
+
+def register(cls_obj=None, encode=None, decode=None, tagged=True):
     """Register a serializer class.
 
     By default the serializer will use the class type "__getstate__" and "__setstate__" methods if an encode and decode
@@ -70,60 +201,52 @@ def register(cls_obj=None, encode=None, decode=None):
         cls_obj (class/type): Class/Type/object to register the serializer encode and decode methods with.
         encode (function): Function to convert an object of this type to a dictionary.
         decode (function): Function to convert a dictionary representing this type into an object.
+        tagged (bool)[True]: If False the encoded value is not tagged with the SERIALIZER_TYPE (plain JSON values).
 
     Returns:
         cls (class/type/function): Class/Type that was registered OR decorator function.
     """
-    global SERIALIZERS
-
     # ===== As Decorator =====
     if cls_obj is None:
         def wrapper(cls):
-            register(cls_obj=cls_obj, encode=encode, decode=decode)
+            register(cls_obj=cls, encode=encode, decode=decode, tagged=tagged)
             return cls
         return wrapper
 
     # ===== Register the class as a serializer =====
-    try:
-        if not inspect.isclass(cls_obj):
-            cls_obj = cls_obj.__class__
-    except (AttributeError, Exception):
-        pass
+    cls_obj = _as_class(cls_obj)
 
     # Save the serializer class
-    serializer = Serializer(cls=cls_obj, encode=encode, decode=decode)
-    registered = False
-    for i, ser in enumerate(SERIALIZERS):
-        if ser.cls == cls_obj:
-            SERIALIZERS[i] = serializer
-            registered = True
-
-    if not registered:
-        SERIALIZERS.append(serializer)
+    serializer = Serializer(cls=cls_obj, encode=encode, decode=decode, tagged=tagged)
+    with _REGISTRY_LOCK:
+        serializers = list(_REGISTRY.serializers)
+        registered = False
+        for i, ser in enumerate(serializers):
+            if ser.cls == cls_obj:
+                serializers[i] = serializer
+                registered = True
+
+        if not registered:
+            serializers.append(serializer)
+        _set_serializers(serializers)
 
     return cls_obj
 
 
 def unregister(cls_obj):
     """Remove a registered serializer."""
-    global SERIALIZERS
-    try:
-        if not inspect.isclass(cls_obj):
-            cls_obj = cls_obj.__class__
-    except (AttributeError, Exception):
-        pass
-
-    for i in range(len(SERIALIZERS)):
-        ser = SERIALIZERS[i]
-        if ser.cls == cls_obj:
-            SERIALIZERS.pop(i)
-            break
+    cls_obj = _as_class(cls_obj)
+    with _REGISTRY_LOCK:
+        serializers = list(_REGISTRY.serializers)
+        for i, ser in enumerate(serializers):
+            if ser.cls == cls_obj:
+                serializers.pop(i)
+                _set_serializers(serializers)
+                break
 
 
 def get_serializer(cls_obj):
     """Return a serializer class for the given type."""
-    global SERIALIZERS
-
     # ===== Serializer from class/type =====
     try:
         if not isinstance(cls_obj, str) and not inspect.isclass(cls_obj):
@@ -131,18 +254,7 @@ def get_serializer(cls_obj):
     except (AttributeError, Exception):
         pass
 
-    first_sub = None
-    for ser in SERIALIZERS:
-        try:
-            # Check if given object is class or matching string serializer_name
-            if ser.cls == cls_obj or ser.serializer_name == cls_obj:
-                return ser
-            elif first_sub is None and issubclass(cls_obj, ser.cls):
-                first_sub = ser
-        except (TypeError, ValueError, Exception):
-            pass
-
-    return first_sub
+    return _REGISTRY.get(cls_obj)
 
 
 # ========== Default Message Object ==========
@@ -154,6 +266,132 @@ class RegisterMetaclass(type):
         return cls
 
 
+# ========== Context ==========
+_CONTEXT = contextvars.ContextVar('serial_json_context', default=None)
+
+
+def get_context():
+    """Return the dictionary of options for the current dumps/loads call."""
+    ctx = _CONTEXT.get()
+    if ctx is None:
+        return {}
+    return ctx
+
+
+def get_option(name, default=None):
+    """Return the option value for the current dumps/loads call or the given default."""
+    return get_context().get(name, default)
+
+
+@contextlib.contextmanager
+def serial_context(**options):
+    """Context manager that sets options that serializers can read with get_option while encoding or decoding.
+
+    Options are thread and asyncio task local.
+
+    Example:
+
+        .. code-block:: python
+
+            with serial_context(buffer_callback=buffers.append):
+                text = json.dumps(obj, default=serial_json.default)
+    """
+    ctx = dict(get_context())
+    ctx.update(options)
+    token = _CONTEXT.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _CONTEXT.reset(token)
+
+
+# ========== Out of band buffers ==========
+def out_of_band(buf, ctx=None):
+    """Give the buffer to the current buffer_callback and return the buffer index.
+
+    Like pickle protocol 5 the buffer is out of band if the callback returns a false value (None).
+
+    Args:
+        buf (memoryview): Raw buffer.
+        ctx (dict)[None]: Context options from get_context. If None the current options are looked up.
+
+    Returns:
+        index (int/None): Index of the buffer in the buffers list or None if the buffer should be serialized in band.
+    """
+    if ctx is None:
+        ctx = get_context()
+    callback = ctx.get('buffer_callback', None)
+    if callback is None or callback(buf):
+        return None
+    return next(ctx['buffer_counter'])
+
+
+def get_buffer(index):
+    """Return the out of band buffer for the index from the buffers given to loads."""
+    buffers = get_option('buffers', None)
+    if buffers is None:
+        raise ValueError('Out of band buffer {} requires the buffers argument'.format(index))
+    return buffers[index]
+
+
+_BUFFER_SIZE = struct.Struct('<Q')
+
+
+def write_buffers(fp, buffers):
+    """Write the out of band buffers to a binary sidecar file.
+
+    Each buffer is written as an 8 byte little endian length followed by the raw data.
+    """
+    chunks = []
+    for buf in buffers:
+        buf = memoryview(buf).cast('B')
+        chunks.append(_BUFFER_SIZE.pack(buf.nbytes))
+        chunks.append(buf)
+    fp.writelines(chunks)
+
+
+def read_buffers(data):
+    """Return the list of buffers from the sidecar data without copying.
+
+    Args:
+        data (bytes/bytearray/mmap.mmap): Contents of a file written by write_buffers.
+
+    Returns:
+        buffers (list): List of memoryview objects that reference the given data.
+    """
+    view = memoryview(data)
+    buffers = []
+    pos = 0
+    while pos < len(view):
+        size = _BUFFER_SIZE.unpack_from(view, pos)[0]
+        pos += _BUFFER_SIZE.size
+        buffers.append(view[pos: pos + size])
+        pos += size
+    return buffers
+
+
+# ========== Streaming ==========
+def stream_value(chunks):
+    """Return a placeholder string that iterencode and dump replace with the JSON text from the chunks iterable.
+
+    This lets a serializer write a large string value in pieces instead of building the whole string in memory.
+
+    Args:
+        chunks (iterable): Iterable of str that together make the JSON value (including the quotes for a string).
+
+    Returns:
+        placeholder (str/None): Value to return from the encoder or None if the current call does not stream (dumps).
+    """
+    ctx = get_context()
+    streams = ctx.get('streams', None)
+    if streams is None:
+        return None
+
+    placeholder = '{}-{}'.format(ctx['stream_token'], len(streams))
+    streams[placeholder] = chunks
+    return placeholder
+
+
 # ========== JSON Parsers ==========
 _default_encoder = json._default_encoder
 _default_decoder = json._default_decoder
@@ -167,7 +405,9 @@ def default(obj):
     if ser is not None:
         # Get the state dictionary
         d = ser.encode(obj)
-        if not isinstance(d, dict):
+        if not ser.tagged:
+            return d
+        elif not isinstance(d, dict):
             d = {SERIALIZER_OBJ: d}
         d[SERIALIZER_TYPE] = ser.serializer_name
         return d
@@ -190,25 +430,353 @@ def object_hook(obj):
     return obj
 
 
+# ========== Builtins ==========
+def _builtins_identity(obj):
+    return obj
+
+
+_BUILTIN_SCALARS = frozenset((str, int, float, bool, type(None)))
+
+
+def _dict_to_builtins(obj):
+    scalars = _BUILTIN_SCALARS
+    return {k: v if type(v) in scalars else get_builtins_plan(type(v))(v) for k, v in obj.items()}
+
+
+def _list_to_builtins(obj):
+    scalars = _BUILTIN_SCALARS
+    return [v if type(v) in scalars else get_builtins_plan(type(v))(v) for v in obj]
+
+
+def _not_serializable(obj):
+    raise TypeError('Object of type {} is not JSON serializable'.format(obj.__class__.__name__))
+
+
+def _serializer_plan(ser):
+    """Return the conversion function for a registered serializer (the same result as the default function)."""
+    name = ser.serializer_name
+    encode = ser.encode
+
+    if not ser.tagged:
+        def plan(obj):
+            return to_builtins(encode(obj))
+    else:
+        def plan(obj):
+            d = encode(obj)
+            if isinstance(d, dict):
+                d = _dict_to_builtins(d)
+            else:
+                d = {SERIALIZER_OBJ: to_builtins(d)}
+            d[SERIALIZER_TYPE] = name
+            return d
+    return plan
+
+
+def get_builtins_plan(cls):
+    """Return the function that converts objects of the given class for to_builtins.
+
+    Plans are cached in the registry snapshot, so registering a serializer starts a new cache.
+    """
+    registry = _REGISTRY
+    plan = registry.plans.get(cls, None)
+    if plan is not None:
+        return plan
+
+    # Same order as the json encoder which only calls default for values it cannot encode itself
+    if cls is type(None) or issubclass(cls, (str, int, float)):
+        plan = _builtins_identity
+    elif issubclass(cls, dict):
+        plan = _dict_to_builtins
+    elif issubclass(cls, (list, tuple)):
+        plan = _list_to_builtins
+    else:
+        ser = registry.get(cls)
+        plan = _not_serializable if ser is None else _serializer_plan(ser)
+
+    registry.plans[cls] = plan
+    return plan
+
+
+def to_builtins(obj):
+    """Convert the object to plain dicts, lists, strs, numbers, bools, and None.
+
+    The result is what dumps would write, so it can be encoded by json.dumps without a default function or passed
+    to any other transport. Use from_builtins to convert it back.
+    """
+    cls = type(obj)
+    if cls in _BUILTIN_SCALARS:
+        return obj
+    return get_builtins_plan(cls)(obj)
+
+
+def from_builtins(obj):
+    """Convert plain dicts and lists from to_builtins (or json.loads without an object_hook) back to objects.
+
+    The given object is not modified.
+    """
+    cls = type(obj)
+    if cls is dict:
+        d = {k: from_builtins(v) for k, v in obj.items()}
+        if SERIALIZER_TYPE in d:
+            return object_hook(d)
+        return d
+    elif cls is list:
+        return [from_builtins(v) for v in obj]
+    return obj
+
+
+def update_state(target, state):
+    """Apply the builtins state (from to_builtins or json.loads without an object_hook) onto the target object.
+
+    Objects with an "__update_state__" method (DataClass) are updated in place and update their nested objects in
+    place. Objects that use the default serializer decode are updated with "__setstate__". Otherwise (or if the
+    state is for a different type) a new object is decoded.
+
+    Args:
+        target (object): Existing object to update.
+        state (object): Builtins state of the object.
+
+    Returns:
+        obj (object): The target object if it was updated in place or a new decoded object.
+    """
+    if type(state) is not dict or state.get(SERIALIZER_TYPE, None) is None:
+        return from_builtins(state)
+
+    ser = get_serializer(target)
+    if ser is None or ser.serializer_name != state[SERIALIZER_TYPE] or 'decode' in ser.__dict__:
+        return from_builtins(state)
+
+    if SERIALIZER_OBJ in state:
+        inner = state[SERIALIZER_OBJ]
+    else:
+        inner = {k: v for k, v in state.items() if k != SERIALIZER_TYPE}
+
+    update = getattr(target, '__update_state__', None)
+    if update is not None:
+        update(inner)
+    else:
+        target.__setstate__(from_builtins(inner))
+    return target
+
+
+def loads_into(target, s, buffers=None, **kwargs):
+    """Decode the JSON text onto an existing object instead of creating a new object.
+
+    Args:
+        target (object): Existing object to update in place.
+        s (str/bytes): JSON text of an object of the same type.
+        buffers (list)[None]: Out of band buffers (see loads).
+        **kwargs (dict): Keyword arguments for loads.
+
+    Returns:
+        target (object): The updated target object.
+    """
+    if buffers is None:
+        return _loads_into(target, s, kwargs)
+
+    # The tagged values are decoded by update_state, so the buffers must be set while it runs
+    with serial_context(buffers=buffers):
+        return _loads_into(target, s, kwargs)
+
+
+def _loads_into(target, s, kwargs):
+    state = loads(s, tagged=False, **kwargs)
+    if update_state(target, state) is not target:
+        raise TypeError('Cannot decode the JSON text into an object of type {}'.format(type(target).__name__))
+    return target
+
+
 @functools.wraps(json.dumps)
-def dumps(obj, **kwargs):
+def dumps(obj, buffer_callback=None, **kwargs):
     kwargs['default'] = default
-    return json.dumps(obj, **kwargs)
+    if buffer_callback is None:
+        return json.dumps(obj, **kwargs)
+
+    with serial_context(buffer_callback=buffer_callback, buffer_counter=itertools.count()):
+        return json.dumps(obj, **kwargs)
+
+
+def _sidecar_path(fp):
+    """Return the file path of the given file object or None if it is not a file on disk."""
+    name = getattr(fp, 'name', None)
+    if isinstance(name, str) and os.path.isfile(name):
+        return os.path.abspath(name)
+    return None
+
+
+def _stream_options(buffer_callback=None, **options):
+    """Return the context options for iterencode and dump (with a new streams dictionary and stream token)."""
+    options.update(streams={}, stream_token='serial_json-stream-{}'.format(uuid.uuid4().hex))
+    if buffer_callback is not None:
+        options.update(buffer_callback=buffer_callback, buffer_counter=itertools.count())
+    return options
+
+
+def _encode_chunks(encoder, obj, streams, token):
+    """Yield the encoded chunks with the streamed values in place of their placeholder strings.
+
+    This must run in the context with the streams and token options.
+    """
+    for chunk in encoder.iterencode(obj):
+        if streams and token in chunk:
+            yield from _expand_streams(chunk, streams, token)
+        else:
+            yield chunk
+
+
+def _expand_streams(chunk, streams, token):
+    """Yield the chunk with the placeholder strings replaced by the streamed chunks."""
+    placeholder = re.compile('"({}-\\d+)"'.format(re.escape(token)))
+    for i, text in enumerate(placeholder.split(chunk)):
+        if i % 2 == 0:
+            if text:
+                yield text
+        else:
+            yield from streams.pop(text)
+
+
+# Number of characters iterencode collects before it yields (small encoder chunks are joined)
+ITERENCODE_BATCH_SIZE = 1 << 16
+
+
+def _next_batch(chunks, size):
+    """Return the next chunks joined up to about size characters or '' at the end."""
+    batch = []
+    total = 0
+    for chunk in chunks:
+        batch.append(chunk)
+        total += len(chunk)
+        if total >= size:
+            break
+    return ''.join(batch)
+
+
+def iterencode(obj, buffer_callback=None, _options=None, **kwargs):
+    """Encode the object and yield the JSON text in pieces.
+
+    Values that serializers stream with stream_value (large ndarrays) are yielded in fixed size chunks instead of
+    being built in memory. Small encoder chunks are joined into pieces of about ITERENCODE_BATCH_SIZE characters.
+
+    Args:
+        obj (object): Object to encode.
+        buffer_callback (function)[None]: Out of band buffer callback (see dumps).
+        **kwargs (dict): json.JSONEncoder keyword arguments and cls.
+
+    Yields:
+        chunk (str): Piece of the JSON text.
+    """
+    kwargs['default'] = default
+    cls = kwargs.pop('cls', None) or json.JSONEncoder
+
+    options = dict(get_context())
+    options.update(_options or {}, ensure_ascii=kwargs.get('ensure_ascii', True))
+    options = _stream_options(buffer_callback, **options)
+
+    # Encode in a separate context so the options do not leak to the caller between pieces. The context is entered
+    # once per piece instead of once per encoder chunk.
+    ctx = contextvars.copy_context()
+    ctx.run(_CONTEXT.set, options)
+    chunks = _encode_chunks(cls(**kwargs), obj, options['streams'], options['stream_token'])
+    while True:
+        text = ctx.run(_next_batch, chunks, ITERENCODE_BATCH_SIZE)
+        if not text:
+            break
+        yield text
 
 
 @functools.wraps(json.dump)
-def dump(obj, fp, **kwargs):
+def dump(obj, fp, buffer_callback=None, sidecar_threshold=None, **kwargs):
     kwargs['default'] = default
-    return json.dump(obj, fp, **kwargs)
+    cls = kwargs.pop('cls', None) or json.JSONEncoder
+    options = {'ensure_ascii': kwargs.get('ensure_ascii', True)}
+
+    # Large arrays are saved as sidecar files next to the json file
+    path = _sidecar_path(fp)
+    if sidecar_threshold is not None and path is not None:
+        options.update(sidecar_threshold=sidecar_threshold, sidecar_dir=os.path.dirname(path),
+                       sidecar_prefix=os.path.basename(path), sidecar_counter=itertools.count())
+
+    # Write chunks like json.dump. Only fp.write runs between the chunks, so the context is set once.
+    options = _stream_options(buffer_callback, **options)
+    streams, token = options['streams'], options['stream_token']
+    with serial_context(**options):
+        write = fp.write
+        for chunk in cls(**kwargs).iterencode(obj):
+            if streams and token in chunk:
+                for text in _expand_streams(chunk, streams, token):
+                    write(text)
+            else:
+                write(chunk)
+
+
+def _as_text(s):
+    """Return UTF-8 bytes as is and decode any other encoding (UTF-16, UTF-32) that json.loads detects."""
+    if not isinstance(s, str):
+        encoding = json.detect_encoding(s)
+        if encoding != 'utf-8':
+            return s.decode(encoding, 'surrogatepass')
+    return s
+
+
+def is_tagged(s):
+    """Return if the JSON string or bytes may contain tagged (SERIALIZER_TYPE) objects."""
+    s = _as_text(s)
+    if isinstance(s, str):
+        return SERIALIZER_TYPE in s
+    return SERIALIZER_TYPE.encode('ascii') in s
+
+
+def _chain_object_hook(hook):
+    """Return an object_hook that decodes tagged objects and then calls the caller's hook for the other dicts."""
+    def chained_hook(obj):
+        obj = object_hook(obj)
+        if type(obj) is dict:
+            return hook(obj)
+        return obj
+    return chained_hook
+
+
+def _loads(s, tagged, kwargs):
+    """Decode with the object_hook only if the text may contain tagged objects.
+
+    A caller's object_hook is called for every dict that is not a tagged object, with or without tags in the text.
+    """
+    if tagged is None:
+        s = _as_text(s)
+        tagged = is_tagged(s)
+    if tagged:
+        hook = kwargs.get('object_hook', None)
+        kwargs['object_hook'] = object_hook if hook is None else _chain_object_hook(hook)
+    elif not kwargs:
+        return json.loads(s)  # Plain JSON uses the stdlib cached decoder without any Python callbacks
+    return json.loads(s, **kwargs)
 
 
 @functools.wraps(json.loads)
-def loads(s, **kwargs):
-    kwargs['object_hook'] = object_hook
-    return json.loads(s, **kwargs)
+def loads(s, buffers=None, tagged=None, **kwargs):
+    # tagged: None scans the text for the SERIALIZER_TYPE marker, True always decodes tagged objects, and False
+    # decodes plain JSON without the object_hook. A given object_hook is called after the serial_json object_hook
+    # for the dicts that are not tagged objects.
+    if buffers is None:
+        return _loads(s, tagged, kwargs)
+
+    with serial_context(buffers=buffers):
+        return _loads(s, tagged, kwargs)
 
 
 @functools.wraps(json.load)
-def load(fp, **kwargs):
-    kwargs['object_hook'] = object_hook
-    return json.load(fp, **kwargs)
+def load(fp, buffers=None, mmap_mode='r', tagged=None, **kwargs):
+    options = {}
+    if buffers is not None:
+        options['buffers'] = buffers
+
+    # Sidecar files are relative to the json file
+    path = _sidecar_path(fp)
+    if path is not None:
+        options.update(sidecar_dir=os.path.dirname(path), mmap_mode=mmap_mode)
+
+    if not options:
+        return _loads(fp.read(), tagged, kwargs)
+
+    with serial_context(**options):
+        return _loads(fp.read(), tagged, kwargs)
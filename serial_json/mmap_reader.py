@@ -0,0 +1,203 @@
+import os
+import mmap
+import array
+import struct
+from serial_json.interface import loads
+
+
+__all__ = ['INDEX_MAGIC', 'INDEX_CHUNK_SIZE', 'build_line_index', 'JsonLinesFile']
+
+
+INDEX_MAGIC = b'SJLI'
+INDEX_HEADER = struct.Struct('<4sQQ')  # Magic, file size, file modification time in nanoseconds
+INDEX_CHUNK_SIZE = 1 << 24
+
+
+# Bytes removed by bytes.strip(). Lines with only these bytes are skipped like in parallel.load_range.
+WHITESPACE = b' \t\n\r\x0b\x0c'
+
+
+def build_line_index(buf, chunk_size=None):
+    """Return an array of the start offsets of the lines in the buffer that are not empty or only whitespace.
+
+    Newlines are found with numpy when it is installed. Otherwise every line is searched for in python.
+
+    Args:
+        buf (bytes/mmap.mmap): JSON lines data.
+        chunk_size (int)[None]: Number of bytes to search at a time. If None INDEX_CHUNK_SIZE is used.
+
+    Returns:
+        offsets (array.array): Unsigned 64 bit start offset for each line.
+    """
+    if chunk_size is None:
+        chunk_size = INDEX_CHUNK_SIZE
+
+    try:
+        import numpy as np
+    except (ImportError, Exception):
+        return _build_line_index_py(buf, chunk_size)
+
+    is_blank = np.zeros(256, dtype=bool)
+    is_blank[list(WHITESPACE)] = True
+
+    def has_content(data):
+        return bool(np.any((data != 32) & ((data < 9) | (data > 13))))
+
+    offsets = array.array('Q')
+    size = len(buf)
+    start = 0  # Start of the current line
+    content = False  # If the current line has any non whitespace bytes so far
+    for chunk_start in range(0, size, chunk_size):
+        data = np.frombuffer(buf, dtype=np.uint8, count=min(chunk_size, size - chunk_start), offset=chunk_start)
+        newlines = np.flatnonzero(data == 10)
+        if len(newlines) == 0:
+            content = content or has_content(data)
+            continue
+
+        # Start of each complete line in the chunk. The first one continues the current line.
+        seg_starts = np.empty(len(newlines), dtype=np.int64)
+        seg_starts[0] = 0
+        seg_starts[1:] = newlines[:-1] + 1
+
+        # Lines that start with a non whitespace byte have content. Only check the rest of the other lines.
+        keep = ~is_blank[data[seg_starts]]
+        keep[0] = keep[0] or content
+        for i in np.flatnonzero(~keep):
+            keep[i] = has_content(data[seg_starts[i]: newlines[i]])
+
+        line_starts = seg_starts + chunk_start
+        line_starts[0] = start
+        offsets.frombytes(line_starts[keep].astype(np.uint64).tobytes())
+
+        start = chunk_start + int(newlines[-1]) + 1
+        content = has_content(data[newlines[-1] + 1:])
+
+    if content:
+        offsets.append(start)  # Last line without a newline
+    return offsets
+
+
+def _build_line_index_py(buf, chunk_size):
+    """Return the line start offsets like build_line_index without numpy."""
+    offsets = array.array('Q')
+    append = offsets.append
+    size = len(buf)
+    start = 0
+    for chunk_start in range(0, size, chunk_size):
+        chunk = buf[chunk_start: chunk_start + chunk_size]
+        find = chunk.find
+        pos = find(b'\n')
+        while pos >= 0:
+            end = chunk_start + pos
+            if end > start and buf[start: end].strip():
+                append(start)
+            start = end + 1
+            pos = find(b'\n', pos + 1)
+
+    if start < size and buf[start: size].strip():
+        append(start)  # Last line without a newline
+    return offsets
+
+
+class JsonLinesFile(object):
+    """Random access reader for a JSON lines file.
+
+    The file is memory mapped and the start offset of every line is indexed when the file is opened. Records are
+    only decoded (through the registered serializers) when they are accessed.
+
+    Args:
+        filename (str): JSON lines file path.
+        index_file (str/bool)[False]: Save and reuse the line index. True saves it as filename + '.idx'. The saved
+            index is rebuilt if the size or modification time of the file changed.
+        **kwargs (dict): Keyword arguments for loads.
+    """
+    def __init__(self, filename, index_file=False, **kwargs):
+        if index_file is True:
+            index_file = filename + '.idx'
+
+        self.filename = filename
+        self.index_file = index_file or None
+        self.loads_kwargs = kwargs
+
+        self._fp = open(filename, 'rb')
+        stat = os.fstat(self._fp.fileno())
+        self._size = stat.st_size
+        self._mtime = stat.st_mtime_ns
+        if self._size > 0:
+            self._mm = mmap.mmap(self._fp.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._mm = b''  # Empty files cannot be memory mapped
+
+        self.offsets = self._load_index()
+        if self.offsets is None:
+            self.offsets = build_line_index(self._mm)
+            self._save_index()
+
+    def _load_index(self):
+        """Return the saved line offsets or None if the index file is missing or out of date."""
+        if self.index_file is None:
+            return None
+
+        try:
+            with open(self.index_file, 'rb') as f:
+                magic, size, mtime = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+                if magic != INDEX_MAGIC or size != self._size or mtime != self._mtime:
+                    return None
+                offsets = array.array('Q')
+                offsets.frombytes(f.read())
+                return offsets
+        except (OSError, struct.error, ValueError, Exception):
+            return None
+
+    def _save_index(self):
+        if self.index_file is None:
+            return
+
+        try:
+            with open(self.index_file, 'wb') as f:
+                f.write(INDEX_HEADER.pack(INDEX_MAGIC, self._size, self._mtime))
+                f.write(self.offsets.tobytes())
+        except (OSError, Exception):
+            pass  # The index is only a cache
+
+    def close(self):
+        if not isinstance(self._mm, bytes):
+            self._mm.close()
+        self._mm = b''
+        self._fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def read_line(self, i):
+        """Return the encoded line (bytes) at the given line index."""
+        if i < 0:
+            i += len(self.offsets)
+        if i < 0 or i >= len(self.offsets):
+            raise IndexError('Line index out of range')
+
+        start = self.offsets[i]
+        end = self._mm.find(b'\n', start)
+        if end < 0:
+            end = self._size
+        return self._mm[start: end]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[idx] for idx in range(*i.indices(len(self)))]
+        return loads(self.read_line(i), **self.loads_kwargs)
+
+    def iter_range(self, start=0, stop=None):
+        """Iterate over the decoded records from start up to (not including) stop."""
+        start, stop, _ = slice(start, stop).indices(len(self))
+        for i in range(start, stop):
+            yield self[i]
+
+    def __iter__(self):
+        return self.iter_range()
@@ -1,37 +1,376 @@
+import os
 import ast
+import json
+import functools
 import numpy as np
-from serial_json.interface import register
+from serial_json.interface import register, get_serializer, get_context, get_option, out_of_band, get_buffer, \
+    stream_value, SERIALIZER_TYPE
+from serial_json.bytes_support import get_binary_encoding, encode_binary, decode_binary, \
+    get_compression, encode_compressed, decompress_binary, decompress_into
 
 
-__all__ = ['np_to_dict', 'np_from_dict', 'rec_from_dict']
+__all__ = ['EXACT_SCALARS', 'LIST_THRESHOLD', 'np_scalar_to_json', 'np_scalar_from_json',
+           'DECODE_READONLY', 'set_decode_readonly', 'SHUFFLE', 'set_shuffle', 'STREAM_THRESHOLD', 'STREAM_CHUNK_SIZE',
+           'np_to_dict', 'np_from_dict', 'rec_from_dict']
+
+
+# If True decoded arrays are read only views of the decoded buffer. If False arrays are writable (may copy).
+DECODE_READONLY = False
+
+
+def set_decode_readonly(readonly=False):
+    """Set if np_from_dict returns read only arrays.
+
+    Read only arrays are views of the decoded buffer. Writable arrays need a copy unless the data was decoded into a
+    mutable buffer (latin1 strings or writable out of band buffers). The 'readonly' option of serial_context overrides
+    the global setting.
+    """
+    global DECODE_READONLY
+    DECODE_READONLY = readonly
+
+
+# Encode numpy scalars as {'value': ..., 'dtype': ...} so they decode to the same numpy type
+EXACT_SCALARS = False
+
+# Numeric arrays with fewer elements are written as a list, since the binary overhead dominates (0 disables)
+LIST_THRESHOLD = 0
+
+# Number of dtype strings to keep parsed np.dtype objects for
+DTYPE_CACHE_SIZE = 256
+
+# Byte shuffle numeric arrays before compressing them (byte planes of slowly varying values compress well)
+SHUFFLE = True
+
+
+def set_shuffle(shuffle=True):
+    """Set if numeric arrays are byte shuffled before they are compressed.
+
+    The 'shuffle' option of serial_context overrides the global setting.
+    """
+    global SHUFFLE
+    SHUFFLE = shuffle
+
+
+def _shuffle(arr):
+    """Return the bytes of a C contiguous array grouped by byte position (all first bytes, all second bytes, ...)."""
+    itemsize = arr.dtype.itemsize
+    return np.ascontiguousarray(arr.reshape(-1).view(np.uint8).reshape(-1, itemsize).T).data
+
+
+def _unshuffle(bts, itemsize, size):
+    """Return a new writable buffer with the shuffled bytes put back in item order."""
+    out = np.empty(size, dtype=np.uint8)
+    out.reshape(-1, itemsize)[...] = np.frombuffer(bts, dtype=np.uint8).reshape(itemsize, -1).T
+    return out
+
+
+# Arrays with at least this many bytes are written in chunks by dump and iterencode
+STREAM_THRESHOLD = 1 << 20
+STREAM_CHUNK_SIZE = 1 << 16  # Rounded down to a multiple of 12 so base64 and base85 chunks can be concatenated
+
+
+def _stream_chunks(buf, encoding):
+    """Yield the JSON string for the encoded array data in fixed size chunks straight from the array buffer."""
+    view = _byte_view(buf)
+    size = max(STREAM_CHUNK_SIZE - (STREAM_CHUNK_SIZE % 12), 12)
+    escape = None
+    if encoding == 'latin1':
+        escape = json.encoder.encode_basestring_ascii if get_option('ensure_ascii', True) else \
+            json.encoder.encode_basestring
+
+    yield '"'
+    for i in range(0, len(view), size):
+        text = encode_binary(view[i: i + size], encoding)
+        if escape is not None:
+            text = escape(text)[1:-1]
+        yield text
+    yield '"'
+
+
+def _contiguous(obj):
+    """Return a C contiguous array with the same memory and the order of that memory ('C' or 'F')."""
+    if obj.flags.c_contiguous:
+        return obj, 'C'
+    elif obj.flags.f_contiguous:
+        return obj.T, 'F'  # Transpose of a fortran array is a C contiguous view of the same memory
+    return np.ascontiguousarray(obj), 'C'
+
+
+def _byte_view(arr):
+    """Return a flat unsigned byte memoryview of a C contiguous array without copying."""
+    return arr.reshape(-1).view(np.uint8).data
+
+
+def _parse_shape(shape):
+    """Return the shape tuple from the shape string ('' is a 0-d array)."""
+    return tuple(int(i) for i in shape.split(',') if i)
+
+
+def _save_sidecar(obj, ctx):
+    """Save a large array as a .npy file next to the json file that dump is writing.
+
+    Returns:
+        filename (str/None): Filename relative to the json file or None if the array was not saved.
+    """
+    threshold = ctx.get('sidecar_threshold', None)
+    if threshold is None or obj.nbytes < threshold or obj.dtype.hasobject:
+        return None
+
+    filename = '{}.{}.npy'.format(ctx['sidecar_prefix'], next(ctx['sidecar_counter']))
+    np.save(os.path.join(ctx['sidecar_dir'], filename), obj, allow_pickle=False)
+    return filename
+
+
+def _load_sidecar(filename):
+    """Memory map the .npy sidecar file in the directory of the json file that load is reading.
+
+    Raises:
+        ValueError: If there is no sidecar_dir (loads or a file object that is not on disk) or if the filename is not
+            a plain file name in that directory (absolute paths, sub directories, and '..').
+    """
+    sidecar_dir = get_option('sidecar_dir', None)
+    if not sidecar_dir:
+        raise ValueError('Cannot load the sidecar file {} without a sidecar_dir. Use load with a file on disk or set '
+                         'the sidecar_dir option of serial_context'.format(repr(filename)))
+    if not isinstance(filename, str) or filename in ('', '.', '..') or os.path.basename(filename) != filename or \
+            os.path.isabs(filename):
+        raise ValueError('Invalid sidecar file name {}. Sidecar files must be in the directory of the json file'
+                         .format(repr(filename)))
+
+    path = os.path.join(sidecar_dir, filename)
+    return np.load(path, mmap_mode=get_option('mmap_mode', 'r'), allow_pickle=False)
+
+
+@functools.lru_cache(maxsize=DTYPE_CACHE_SIZE)
+def _parse_dtype(dtype):
+    """Return the numpy dtype from the dtype string (record array descr strings are python literals).
+
+    Results are cached since messages often carry many small arrays with the same dtype.
+    """
+    if dtype[:1] in ('[', '(', '{'):
+        try:
+            dtype = ast.literal_eval(dtype)
+        except (ValueError, TypeError, Exception):
+            pass
+    return np.dtype(dtype)
+
+
+def _dtype_str(dtype):
+    """Return the dtype string that _parse_dtype can read."""
+    if getattr(dtype, 'names', None) is not None:
+        return str(dtype.descr)  # Record array and structured array support
+    return str(dtype)
 
 
 def np_to_dict(obj):
     """Convert a numpy array to a json serializable dictionary."""
-    dtype = str(obj.dtype)
-    if getattr(obj.dtype, 'names', None) is not None:
-        dtype = str(obj.dtype.descr)  # Record array and structured array support
-    return {'data': bytes(obj.data),  # REQUIRES bytes_support!
-            'shape': ','.join((str(i) for i in obj.shape)), 'dtype': dtype}
-
-
-def np_from_dict(obj):
-    """Convert a json dictionary to a numpy array."""
-    byts = obj.get('data', b'')
-    shape = tuple(int(i) for i in obj.get('shape', '-1').split(','))
-    dtype = obj.get('dtype', '<f4')
-    try:
-        dtype = ast.literal_eval(dtype)
-    except (ValueError, TypeError, Exception):
-        pass
-    dtype = np.dtype(dtype)
-
-    # Create an array and override the memoryview
+    dtype = _dtype_str(obj.dtype)
+    ctx = get_context()  # Look up the options once
+
+    sidecar = _save_sidecar(obj, ctx)
+    if sidecar is not None:
+        return {'npy': sidecar}
+
+    if obj.size < ctx.get('list_threshold', LIST_THRESHOLD) and obj.dtype.kind in 'biuf':
+        return {'list': obj.tolist(), 'shape': ','.join((str(i) for i in obj.shape)), 'dtype': dtype}
+
+    d = {'shape': ','.join((str(i) for i in obj.shape)), 'dtype': dtype}
+    if obj.dtype.hasobject:
+        return _object_dict(obj, d)
+
+    buf, order = _contiguous(obj)
+    d.update(_encode_data(obj, buf, ctx))
+    if order != 'C':
+        d['order'] = order
+    return d
+
+
+def _encode_data(obj, buf, ctx=None):
+    """Return the dictionary items for the array data (out of band buffer, compressed, streamed, or inline)."""
+    if ctx is None:
+        ctx = get_context()
+    index = out_of_band(_byte_view(buf), ctx)
+    if index is not None:
+        return {'buffer': index}
+
+    compression = get_compression(obj.nbytes, ctx)
+    if compression is not None:
+        shuffle = ctx.get('shuffle', SHUFFLE) and obj.dtype.itemsize > 1 and obj.dtype.kind in 'biufcmM'
+        d = encode_compressed(_shuffle(buf) if shuffle else _byte_view(buf), compression, ctx)
+        if d is not None:
+            if shuffle:
+                d['shuffle'] = True
+            return d  # Otherwise compressing does not make the data smaller
+
+    encoding = get_binary_encoding(ctx)
+
+    # Large arrays are written in chunks by dump and iterencode
+    data = None
+    if obj.nbytes >= ctx.get('stream_threshold', STREAM_THRESHOLD):
+        data = stream_value(_stream_chunks(buf, encoding))
+
+    if data is None:
+        data = encode_binary(_byte_view(buf), encoding)
+    return {'data': data, 'encoding': encoding}
+
+
+def np_from_dict(obj, readonly=None):
+    """Convert a json dictionary to a numpy array.
+
+    Args:
+        obj (dict): Dictionary from np_to_dict.
+        readonly (bool)[None]: If True return a read only view of the decoded buffer.
+            If None use the 'readonly' option or DECODE_READONLY.
+
+    Returns:
+        arr (np.ndarray): Numpy array.
+    """
+    if 'npy' in obj:
+        return _load_sidecar(obj['npy'])
+    elif 'list' in obj:
+        return np.array(obj['list'], dtype=_parse_dtype(obj.get('dtype', '<f4'))).reshape(
+            _parse_shape(obj.get('shape', '-1')))
+
+    if readonly is None:
+        readonly = get_option('readonly', DECODE_READONLY)
+
+    shape = _parse_shape(obj.get('shape', '-1'))
+    dtype = _parse_dtype(obj.get('dtype', '<f4'))
+    if 'objects' in obj:
+        return _object_array(obj, shape, dtype)
+
+    # View the decoded buffer without copying
+    byts = _decode_buffer(obj, dtype, readonly)
+    arr = np.frombuffer(byts, dtype=dtype).reshape(shape, order=obj.get('order', 'C'))
+    if readonly:
+        arr.flags.writeable = False
+    elif not arr.flags.writeable:
+        arr = arr.copy(order='K')
+    return arr
+
+
+def _decode_buffer(obj, dtype, readonly=False):
+    """Return the buffer for the array data (out of band buffer, compressed, or inline)."""
+    if 'buffer' in obj:
+        byts = get_buffer(obj['buffer'])
+    else:
+        byts = obj.get('data', b'')  # Legacy files nest latin1 data as tagged bytes (already decoded, read only)
+    encoding = obj.get('encoding', None)
+    compression = obj.get('compression', None)
+    if isinstance(byts, str):
+        if not readonly and compression is None and encoding in (None, 'latin1'):
+            byts = bytearray(byts, 'latin1')  # Decode directly into a writable buffer
+        else:
+            byts = decode_binary(byts, encoding)
+    if compression is not None:
+        size = obj.get('size', None)
+        shuffle = obj.get('shuffle', False)
+        if not readonly and not shuffle and size is not None:
+            out = np.empty(size, dtype=np.uint8)  # Decompress straight into the writable array buffer
+            nbytes = decompress_into(byts, compression, out)
+            if nbytes != size:
+                raise ValueError('The decompressed data has {} bytes instead of {}'.format(nbytes, size))
+            return out
+
+        byts = decompress_binary(byts, compression, size)
+        if shuffle:
+            byts = _unshuffle(byts, dtype.itemsize, len(byts))
+    return byts
+
+
+def _split_object_fields(dtype):
+    """Return the object field names and the packed dtype of the remaining fixed width fields."""
+    objects = [n for n in dtype.names if dtype.fields[n][0].hasobject]
+    for n in objects:
+        if dtype.fields[n][0].base.names is not None:
+            raise TypeError('Object fields inside nested structured fields are not supported ({})'.format(n))
+    fixed = np.dtype([(n, dtype.fields[n][0]) for n in dtype.names if n not in objects])
+    return objects, fixed
+
+
+def _fill_objects(target, values):
+    """Set the object values in C order into the target array (which may be a non contiguous field view)."""
+    flat = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        flat[i] = value  # Item assignment keeps lists and tuples as single objects
+    target[...] = flat.reshape(target.shape)
+
+
+def _object_dict(obj, d):
+    """Add the items for an array with object fields to the dictionary.
+
+    Object values are serialized as lists (through the registry). The fixed width fields of a structured array are
+    packed into a separate binary block, so the raw PyObject pointers are never written.
+    """
+    if obj.dtype.names is None:
+        d['objects'] = obj.ravel().tolist()
+        return d
+
+    objects, fixed = _split_object_fields(obj.dtype)
+    d['objects'] = {n: obj[n].ravel().tolist() for n in objects}
+    if fixed.names:
+        packed = np.empty(obj.shape, dtype=fixed)
+        for n in fixed.names:
+            packed[n] = obj[n]
+        d.update(_encode_data(packed, packed))
+    return d
+
+
+def _object_array(obj, shape, dtype):
+    """Create the array with object fields from the dictionary made by _object_dict."""
     arr = np.empty(shape, dtype=dtype)
-    arr.data = byts
+    objects = obj['objects']
+    if dtype.names is None:
+        _fill_objects(arr, objects)
+        return arr
+
+    names, fixed = _split_object_fields(dtype)
+    if fixed.names:
+        packed = np.frombuffer(_decode_buffer(obj, fixed), dtype=fixed).reshape(shape)
+        for n in fixed.names:
+            arr[n] = packed[n]
+    for n in names:
+        _fill_objects(arr[n], objects.get(n, []))
     return arr
 
 
+def _scalar_value(obj):
+    """Return the plain JSON value for a numpy scalar."""
+    if isinstance(obj, np.datetime64):
+        return np.datetime_as_string(obj)
+    elif isinstance(obj, np.timedelta64):
+        return int(obj.astype(np.int64))  # Count of the dtype unit
+    elif isinstance(obj, np.complexfloating):
+        return [float(obj.real), float(obj.imag)]
+    value = obj.item()
+    if isinstance(value, tuple):  # Structured scalar
+        value = list(value)
+    return value
+
+
+def np_scalar_to_json(obj):
+    """Convert a numpy scalar to a plain JSON number, bool, or ISO string.
+
+    If the 'exact_scalars' option or EXACT_SCALARS is True return a tagged dictionary with the dtype instead.
+    """
+    value = _scalar_value(obj)
+    if get_option('exact_scalars', EXACT_SCALARS):
+        return {'value': value, 'dtype': _dtype_str(obj.dtype),
+                SERIALIZER_TYPE: get_serializer(np.generic).serializer_name}
+    return value
+
+
+def np_scalar_from_json(obj):
+    """Convert a scalar dictionary from np_scalar_to_json back to the numpy scalar type."""
+    dtype = _parse_dtype(obj.get('dtype', '<f8'))
+    value = obj.get('value', 0)
+    if dtype.kind == 'c':
+        value = complex(*value)
+    elif dtype.names is not None:
+        value = tuple(value)
+    return np.array(value, dtype=dtype)[()]
+
+
 def rec_from_dict(obj):
     """Convert a json dictionary to a numpy record array."""
     return np_from_dict(obj).view(np.recarray)
@@ -39,3 +378,4 @@ def rec_from_dict(obj):
 
 register(np.ndarray, np_to_dict, np_from_dict)
 register(np.recarray, np_to_dict, rec_from_dict)  # Record array support
+register(np.generic, np_scalar_to_json, np_scalar_from_json, tagged=False)  # Scalars are plain JSON values
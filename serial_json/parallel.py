@@ -0,0 +1,246 @@
+import os
+import importlib
+import collections
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from serial_json import interface
+from serial_json.interface import register, get_serializer, loads
+
+
+__all__ = ['callable_ref', 'resolve_ref', 'export_registry', 'load_registry', 'init_worker', 'ensure_registry',
+           'pool_initializer', 'LINES_CHUNK_SIZE', 'line_ranges', 'load_range', 'load_lines']
+
+
+def callable_ref(obj):
+    """Return the importable 'module:qualname' reference for a class or function or None if it cannot be imported
+    (lambdas, nested functions, and local classes).
+    """
+    module = getattr(obj, '__module__', None)
+    qualname = getattr(obj, '__qualname__', None)
+    if not module or not qualname or '<' in qualname:
+        return None
+
+    ref = '{}:{}'.format(module, qualname)
+    try:
+        if resolve_ref(ref) is not obj:
+            return None
+    except (ImportError, AttributeError, Exception):
+        return None
+    return ref
+
+
+def resolve_ref(ref):
+    """Import and return the object for a 'module:qualname' reference."""
+    module, qualname = ref.split(':', 1)
+    obj = importlib.import_module(module)
+    for name in qualname.split('.'):
+        obj = getattr(obj, name)
+    return obj
+
+
+def export_registry(strict=False):
+    """Return a picklable spec of the registered serializers.
+
+    Every entry has the 'modules' to import and the 'cls', 'encode', and 'decode' references. Encode and decode
+    functions that cannot be imported (lambdas and nested functions) are None with 'import_only' set, which means
+    importing the modules registers the serializer again.
+
+    Args:
+        strict (bool)[False]: Raise a ValueError for serializers of classes that cannot be imported instead of
+            skipping them.
+
+    Returns:
+        spec (list): List of entry dictionaries in registration order.
+    """
+    spec = []
+    for ser in interface.SERIALIZERS:
+        cls_ref = callable_ref(ser.cls)
+        if cls_ref is None:
+            if strict:
+                raise ValueError('Cannot export the serializer for {} which cannot be imported'.format(
+                                 ser.serializer_name))
+            continue
+
+        entry = {'modules': [ser.cls.__module__], 'cls': cls_ref, 'encode': None, 'decode': None,
+                 'tagged': ser.tagged, 'import_only': False}
+        for attr in ('encode', 'decode'):
+            func = ser.__dict__.get(attr, None)  # Not in the instance dict for the default __getstate__/__setstate__
+            if func is not None:
+                ref = callable_ref(func)
+                module = getattr(func, '__module__', None)
+                if module and module not in entry['modules']:
+                    entry['modules'].append(module)
+                entry['import_only'] = entry['import_only'] or ref is None
+                entry[attr] = ref
+
+        spec.append(entry)
+    return spec
+
+
+def load_registry(spec):
+    """Import the modules and register the serializers from a spec made by export_registry."""
+    for module in dict.fromkeys(module for entry in spec for module in entry['modules']):
+        importlib.import_module(module)
+
+    missing = []
+    for entry in spec:
+        cls = resolve_ref(entry['cls'])
+        if entry['import_only']:
+            ser = get_serializer(cls)
+            if ser is None or ser.cls is not cls:
+                missing.append(entry['cls'])
+            continue
+
+        ser = get_serializer(cls)
+        encode = resolve_ref(entry['encode']) if entry['encode'] else None
+        decode = resolve_ref(entry['decode']) if entry['decode'] else None
+        if ser is None or ser.cls is not cls or ser.tagged != entry['tagged'] or \
+                ser.__dict__.get('encode', None) is not encode or ser.__dict__.get('decode', None) is not decode:
+            register(cls, encode, decode, tagged=entry['tagged'])
+
+    if missing:
+        raise ValueError('Importing the modules did not register the serializers for {}'.format(', '.join(missing)))
+
+
+_WORKER_SPEC = None
+
+
+def init_worker(spec, lazy=False):
+    """Worker process initializer that rebuilds the registry.
+
+    Args:
+        spec (list): Registry spec from export_registry.
+        lazy (bool)[False]: Only save the spec. The registry is rebuilt by the first ensure_registry call.
+    """
+    global _WORKER_SPEC
+    _WORKER_SPEC = spec
+    if not lazy:
+        ensure_registry()
+
+
+def ensure_registry():
+    """Rebuild the registry from the worker spec if it was not rebuilt yet."""
+    global _WORKER_SPEC
+    spec, _WORKER_SPEC = _WORKER_SPEC, None
+    if spec is not None:
+        load_registry(spec)
+
+
+def pool_initializer(spec=None, lazy=False):
+    """Return the initializer keyword arguments for ProcessPoolExecutor or multiprocessing.Pool.
+
+    Example:
+
+        with ProcessPoolExecutor(4, **pool_initializer()) as pool:
+            ...
+
+    Args:
+        spec (list)[None]: Registry spec. If None the current registry is exported.
+        lazy (bool)[False]: Rebuild the registry on the first ensure_registry call instead of at startup.
+
+    Returns:
+        kwargs (dict): Dictionary with the 'initializer' and 'initargs'.
+    """
+    if spec is None:
+        spec = export_registry()
+    return {'initializer': init_worker, 'initargs': (spec, lazy)}
+
+
+# ========== Parallel JSON lines ==========
+LINES_CHUNK_SIZE = 1 << 24  # Number of bytes each worker decodes at a time
+
+
+def line_ranges(path, chunk_size=None):
+    """Return a list of (start, end) byte ranges of about chunk_size bytes that start and end on line boundaries."""
+    if chunk_size is None:
+        chunk_size = LINES_CHUNK_SIZE
+
+    size = os.path.getsize(path)
+    ranges = []
+    start = 0
+    with open(path, 'rb') as f:
+        while start < size:
+            end = start + chunk_size
+            if end >= size:
+                end = size
+            else:
+                # Move the end to just after the next newline
+                f.seek(end)
+                while True:
+                    block = f.read(1 << 16)
+                    if not block:
+                        end = size
+                        break
+                    pos = block.find(b'\n')
+                    if pos >= 0:
+                        end += pos + 1
+                        break
+                    end += len(block)
+
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def load_range(path, start, end, kwargs=None):
+    """Return the list of decoded records for the non empty lines in the byte range of a JSON lines file."""
+    ensure_registry()
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return [loads(line, **(kwargs or {})) for line in data.split(b'\n') if line.strip()]
+
+
+def load_lines(path, workers=None, ordered=True, chunk_size=None, max_pending=None, mp_context=None, **kwargs):
+    """Decode a JSON lines file in parallel worker processes and yield the records.
+
+    The file is split into byte ranges on line boundaries. Each worker rebuilds the registry from the current
+    registry spec and decodes whole ranges.
+
+    Args:
+        path (str): JSON lines file path.
+        workers (int)[None]: Number of worker processes. None uses os.cpu_count().
+        ordered (bool)[True]: Yield the records in file order. If False records are yielded as soon as a range is
+            decoded.
+        chunk_size (int)[None]: Approximate number of bytes in each range. None uses LINES_CHUNK_SIZE.
+        max_pending (int)[None]: Maximum number of ranges being decoded or waiting to be yielded, which bounds the
+            memory. None uses 2 * workers.
+        mp_context (multiprocessing.context.BaseContext)[None]: Multiprocessing context for the process pool.
+        **kwargs (dict): Keyword arguments for loads.
+
+    Yields:
+        record (object): Decoded record for every non empty line.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if max_pending is None:
+        max_pending = 2 * workers
+    max_pending = max(max_pending, 1)
+
+    path = os.path.abspath(path)
+    ranges = iter(line_ranges(path, chunk_size))
+    pending = collections.deque()
+
+    pool = ProcessPoolExecutor(workers, mp_context=mp_context, **pool_initializer(lazy=True))
+    try:
+        def submit():
+            while len(pending) < max_pending:
+                try:
+                    start, end = next(ranges)
+                except StopIteration:
+                    break
+                pending.append(pool.submit(load_range, path, start, end, kwargs))
+
+        submit()
+        while pending:
+            if ordered:
+                future = pending.popleft()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = next(fut for fut in pending if fut in done)
+                pending.remove(future)
+
+            records = future.result()
+            submit()  # Keep the workers busy while the records are consumed
+            yield from records
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
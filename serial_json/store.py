@@ -0,0 +1,267 @@
+import os
+import threading
+from serial_json.interface import dumps, loads, from_builtins
+
+
+__all__ = ['DELETE_KEY', 'RecordStore']
+
+
+DELETE_KEY = 'RECORD_STORE_DELETE'  # A log line {DELETE_KEY: key} removes the record with that key
+
+
+class RecordStore(object):
+    """Append only JSON lines record store.
+
+    Every put appends the encoded record as one line to the log file and an in memory index maps each key to the
+    offset and length of the newest line for that key. Reading a record seeks to the line and decodes only that
+    line. Obsolete lines are removed by compacting the log which copies the live lines to a new file.
+
+    Args:
+        filename (str): Log file path. The file is created if it does not exist.
+        key (str/function)['id']: Field name (attribute or dictionary key) of the record key or a function that
+            returns the key for a record.
+        compact_ratio (float)[0.5]: Compact once this fraction of the lines in the log is obsolete.
+        compact_min (int)[1000]: Minimum number of obsolete lines before compacting automatically.
+        auto_compact (bool)[True]: Compact automatically in a background thread.
+        **kwargs (dict): Keyword arguments for dumps (indent is not allowed).
+    """
+    def __init__(self, filename, key='id', compact_ratio=0.5, compact_min=1000, auto_compact=True, **kwargs):
+        if kwargs.get('indent', None) is not None:
+            raise ValueError('Records must be encoded on a single line. The indent argument is not allowed.')
+
+        self.filename = os.path.abspath(filename)
+        self.key = key
+        self.compact_ratio = compact_ratio
+        self.compact_min = compact_min
+        self.auto_compact = auto_compact
+        self.dumps_kwargs = kwargs
+
+        self._lock = threading.RLock()
+        self._index = {}  # key: (offset, length)
+        self._lines = 0  # Number of lines in the log including obsolete lines
+        self._compact_thread = None
+        self._fp = None
+        self._open()
+
+    def get_key(self, record):
+        """Return the key for the given record."""
+        if callable(self.key):
+            return self.key(record)
+        elif isinstance(record, dict):
+            return record[self.key]
+        return getattr(record, self.key)
+
+    def _open(self):
+        """Open the log file and build the index."""
+        self._fp = open(self.filename, 'a+b')
+        self._fp.seek(0)
+        self._index = {}
+        self._lines = 0
+
+        offset = 0
+        for line in self._fp:
+            if not line.endswith(b'\n'):
+                break  # Incomplete last line from an interrupted write
+
+            # Complete lines that cannot be parsed are skipped (and counted as obsolete), never truncated
+            self._lines += 1
+            try:
+                state = loads(line, tagged=False)
+                if isinstance(state, dict) and list(state) == [DELETE_KEY]:
+                    self._index.pop(self._state_key(state[DELETE_KEY]), None)
+                else:
+                    self._index[self._record_key(state)] = (offset, len(line))
+            except (ValueError, TypeError, KeyError, AttributeError, Exception):
+                pass
+            offset += len(line)
+
+        # Remove the incomplete tail, so new lines start on a line boundary
+        self._fp.seek(0, os.SEEK_END)
+        if self._fp.tell() != offset:
+            self._fp.truncate(offset)
+
+    @staticmethod
+    def _state_key(value):
+        """Return the key object for a key value that was parsed without the object_hook."""
+        if isinstance(value, (dict, list)):
+            return from_builtins(value)
+        return value
+
+    def _record_key(self, state):
+        """Return the key for a record that was parsed without the object_hook.
+
+        Records are only fully decoded if the key is a function or the key field is not in the state dictionary.
+        """
+        if not callable(self.key) and isinstance(state, dict) and self.key in state:
+            return self._state_key(state[self.key])
+        return self.get_key(from_builtins(state))
+
+    def close(self):
+        """Wait for the background compaction and close the log file."""
+        thread = self._compact_thread
+        if thread is not None:
+            thread.join()
+        with self._lock:
+            if self._fp is not None:
+                self._fp.close()
+                self._fp = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _append(self, line):
+        """Append the encoded line to the log and return the offset."""
+        self._fp.seek(0, os.SEEK_END)
+        offset = self._fp.tell()
+        self._fp.write(line)
+        self._fp.flush()
+        self._lines += 1
+        return offset
+
+    def _encode(self, obj):
+        return (dumps(obj, **self.dumps_kwargs) + '\n').encode('utf-8')
+
+    def put(self, record):
+        """Add or replace the record with the same key."""
+        key = self.get_key(record)
+        line = self._encode(record)
+        with self._lock:
+            self._index[key] = (self._append(line), len(line))
+        self._check_compact()
+
+    def delete(self, key):
+        """Remove the record with the given key."""
+        line = self._encode({DELETE_KEY: key})
+        with self._lock:
+            if key not in self._index:
+                raise KeyError(key)
+            self._append(line)
+            del self._index[key]
+        self._check_compact()
+
+    def read_line(self, key):
+        """Return the encoded line (bytes) for the given key."""
+        with self._lock:
+            offset, length = self._index[key]
+            self._fp.seek(offset)
+            return self._fp.read(length)
+
+    def get(self, key, default=None):
+        """Return the record for the given key or the default value."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __getitem__(self, key):
+        return loads(self.read_line(key))
+
+    def __setitem__(self, key, record):
+        if self.get_key(record) != key:
+            raise KeyError('The record key {} does not match {}'.format(repr(self.get_key(record)), repr(key)))
+        self.put(record)
+
+    def __delitem__(self, key):
+        self.delete(key)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def keys(self):
+        with self._lock:
+            return list(self._index)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def values(self):
+        for key in self.keys():
+            try:
+                yield self[key]
+            except KeyError:
+                pass  # Deleted while iterating
+
+    def items(self):
+        for key in self.keys():
+            try:
+                yield key, self[key]
+            except KeyError:
+                pass  # Deleted while iterating
+
+    @property
+    def obsolete(self):
+        """Return the number of obsolete lines in the log."""
+        return self._lines - len(self._index)
+
+    def needs_compact(self):
+        """Return if enough lines are obsolete to compact the log."""
+        obsolete = self.obsolete
+        return obsolete >= self.compact_min and obsolete >= self.compact_ratio * self._lines
+
+    def _check_compact(self):
+        if self.auto_compact and self.needs_compact():
+            self.compact(wait=False)
+
+    def compact(self, wait=True):
+        """Rewrite the log file with only the newest line for each key.
+
+        Args:
+            wait (bool)[True]: If False compact in a background thread and return immediately.
+        """
+        with self._lock:
+            if self._compact_thread is not None:
+                thread = self._compact_thread
+            else:
+                thread = self._compact_thread = threading.Thread(target=self._compact, daemon=True)
+                thread.start()
+        if wait:
+            thread.join()
+
+    def _compact(self):
+        try:
+            tmp_filename = self.filename + '.compact'
+
+            # Copy the live lines without holding the lock, so puts and gets continue while compacting
+            with self._lock:
+                index = dict(self._index)
+                self._fp.seek(0, os.SEEK_END)
+                end = self._fp.tell()
+
+            new_index = {}
+            with open(self.filename, 'rb') as src, open(tmp_filename, 'wb') as dst:
+                for key, (offset, length) in sorted(index.items(), key=lambda item: item[1][0]):
+                    src.seek(offset)
+                    new_index[key] = (dst.tell(), length)
+                    dst.write(src.read(length))
+
+                # Copy the lines appended during the compaction and swap the files
+                with self._lock:
+                    size = dst.tell()
+                    src.seek(end)
+                    tail = src.read()
+                    dst.write(tail)
+                    dst.flush()
+                    os.fsync(dst.fileno())
+
+                    for key, (offset, length) in self._index.items():
+                        if offset >= end:
+                            new_index[key] = (offset - end + size, length)
+                    new_index = {key: new_index[key] for key in self._index}
+
+                    self._fp.close()
+                    dst.close()
+                    src.close()
+                    os.replace(tmp_filename, self.filename)
+
+                    self._fp = open(self.filename, 'a+b')
+                    self._index = new_index
+                    self._lines = len(index) + tail.count(b'\n')
+        finally:
+            with self._lock:
+                self._compact_thread = None
@@ -1,5 +1,6 @@
+import datetime
 from serial_json.interface import register
-from serial_json.dataclasses import field_property
+from serial_json.dataclasses import MISSING, field_property
 
 
 __all__ = ['Weekdays', 'weekdays_property', 'weekdays_attr_property']
@@ -29,6 +30,8 @@ def weekdays_property(attr, allow_none=True, required=False, **kwargs):
             m = MyClass()
             m.weekdays = 'Sunday'
 
+    The field is serialized as the untagged integer bitmask (`Weekdays.bits`), which the field reads back with
+    `Weekdays.from_bits`. Setting the property to an int is the same as `Weekdays(int)` (a weekday index).
     """
     if not attr.startswith('_'):
         attr = '_' + attr
@@ -47,9 +50,25 @@ def weekdays_property(attr, allow_none=True, required=False, **kwargs):
         delattr(self, attr)
 
     doc = 'Property to force a Weekdays object'
+    kwargs.setdefault('encode_state', _weekdays_to_state)
+    kwargs.setdefault('decode_state', _weekdays_from_state)
     return field_property(fget, fset, fdel, doc=doc, required=required, **kwargs)
 
 
+def _weekdays_to_state(value):
+    """Return the integer bitmask of a Weekdays field value for the serialized state."""
+    if isinstance(value, Weekdays):
+        return value.bits
+    return value
+
+
+def _weekdays_from_state(value):
+    """Return the Weekdays for a serialized field value (integer bitmask, or a list of names in older data)."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return Weekdays.from_bits(value)
+    return value
+
+
 def weekdays_attr_property(attr, weekday, allow_none=True, required=False, **kwargs):
     """Return a property to access Weekdays.sunday as a property.
 
@@ -83,20 +102,20 @@ def weekdays_attr_property(attr, weekday, allow_none=True, required=False, **kwa
 
 def _weekday_prop(name):
     def fget(self):
-        return name in self
+        return bool(self._bits & self._BITS[name])
 
     def fset(self, value):
         if value:
-            self.append(name)
-        elif name in self:
-            self.remove(name)
+            self._bits |= self._BITS[name]
+        else:
+            self._bits &= ~self._BITS[name]
 
     return property(fget, fset)
 
 
 @register
-class Weekdays(list):
-    """Sorted list of weekdays.
+class Weekdays(object):
+    """Sorted collection of weekdays stored as a 7 bit integer.
 
     Features:
       * If no arguments are given the list will be populated with all weekday names.
@@ -104,6 +123,10 @@ class Weekdays(list):
       * Weekdays can be added or removed by a property `my_week.monday = False` or `my_week.tuesday = True`.
       * Abbreviations ("Sun", "Mon", "Tue") and weekday indexes (where monday is 0, sunday is 6) are allowed.
         * Abbreviations and indexes work with init, append, insert, extend, remove, __add__, __contains__
+      * Set operations `|`, `&`, and `-` work with other Weekdays, lists of names, or a single name.
+      * The list API (iteration, indexing, len, append, remove, pop, ...) is a view of the sorted weekday names.
+      * Serializes as the integer bitmask (`Weekdays.bits`). The old list of names is still accepted.
+        `weekdays_property` fields are written as the untagged bitmask.
 
     Args:
         *args (tuple/object): Positional arguments of names to be in the list of weekdays.
@@ -111,6 +134,9 @@ class Weekdays(list):
         **kwargs (dict/object): Keyword arguments for weekday values.
             {"Sunday": True, "Monday": True, "Tue": True, "Fri": False}
     """
+    __slots__ = ('_bits',)
+    __hash__ = None  # Mutable like a list
+
     SUNDAY_VALUE = 'sunday'
     MONDAY_VALUE = 'monday'
     TUESDAY_VALUE = 'tuesday'
@@ -135,6 +161,11 @@ class Weekdays(list):
                'saturday': SATURDAY_VALUE, 'saturdays': SATURDAY_VALUE, 'sat': SATURDAY_VALUE, 5: SATURDAY_VALUE,
                }
 
+    # Bit for every MAPPING key and the weekday name for every bit
+    _BITS = {key: 1 << i for key, i in zip(MAPPING, map(DAYS.get, MAPPING.values()))}
+    _NAMES = tuple(sorted(DAYS, key=DAYS.get))
+    ALL_BITS = (1 << len(DAYS)) - 1
+
     sunday = _weekday_prop('sunday')
     monday = _weekday_prop('monday')
     tuesday = _weekday_prop('tuesday')
@@ -165,21 +196,50 @@ class Weekdays(list):
         """
         if len(args) == 0 and len(kwargs) == 0:
             # If no arguments given assume all True
-            values = self._all_true.copy()
+            self._bits = self.ALL_BITS
         else:
             if len(args) == 1 and is_iterable(args[0]):
                 args = args[0]
-            values = self._all_false.copy()
-            values.update({self.as_attr(arg): True for arg in args if self.is_attr(arg)})
-            values.update({self.as_attr(k): v for k, v in kwargs.items() if self.is_attr(k)})
+            bits = 0
+            for arg in args:
+                if isinstance(arg, int) and not isinstance(arg, bool) and arg not in self.MAPPING:
+                    raise ValueError('Invalid weekday index {}. Use Weekdays.from_bits for an integer bitmask'
+                                     .format(arg))
+                bits |= self.as_bit(arg, 0)
+            for k, v in kwargs.items():
+                if v:
+                    bits |= self.as_bit(k, 0)
+                else:
+                    bits &= ~self.as_bit(k, 0)
+            self._bits = bits
+
+    @classmethod
+    def from_bits(cls, bits):
+        """Create Weekdays from the integer bitmask where sunday is bit 0 and saturday is bit 6."""
+        obj = cls.__new__(cls)
+        obj._bits = int(bits) & cls.ALL_BITS
+        return obj
+
+    @property
+    def bits(self):
+        """Return the integer bitmask where sunday is bit 0 and saturday is bit 6."""
+        return self._bits
+
+    @bits.setter
+    def bits(self, bits):
+        self._bits = int(bits) & self.ALL_BITS
 
-        super().__init__((k for k, v in values.items() if v))
+    def __int__(self):
+        return self._bits
 
     @classmethod
     def is_attr(cls, value):
         if isinstance(value, str):
             value = value.lower()
-        return value in cls.MAPPING
+        try:
+            return value in cls.MAPPING
+        except TypeError:
+            return False
 
     @classmethod
     def as_attr(cls, value):
@@ -191,58 +251,187 @@ class Weekdays(list):
 
         return value
 
+    @classmethod
+    def as_bit(cls, value, default=MISSING):
+        """Return the bit for the given weekday name, abbreviation, or index."""
+        if isinstance(value, str):
+            value = value.lower()
+        try:
+            return cls._BITS[value]
+        except (KeyError, TypeError):
+            if default is not MISSING:
+                return default
+            raise ValueError('Invalid weekday given!') from None
+
+    @classmethod
+    def _other_bits(cls, other):
+        """Return the bitmask for another Weekdays, weekday name, or iterable of weekday names."""
+        if isinstance(other, Weekdays):
+            return other._bits
+        elif isinstance(other, str):
+            return cls.as_bit(other)
+
+        bits = 0
+        for n in other:
+            bits |= cls.as_bit(n, 0)
+        return bits
+
     def is_valid(self, weekday):
         """Return if the given weekday is in this list of Weekdays."""
         return weekday in self
 
-    def append(self, value):
-        value = self.as_attr(value)
-        if not list.__contains__(self, value):
-            super().append(value)
-            self.sort(key=self.DAYS.get)
+    # ===== Schedule matching =====
+    @classmethod
+    def day_index(cls, date):
+        """Return the DAYS index (sunday is 0) for the given date or datetime."""
+        return cls.DAYS[cls.MAPPING[date.weekday()]]
 
-    def insert(self, index, value):
-        value = self.as_attr(value)
-        if not list.__contains__(self, value):
-            super().insert(index, value)
-            self.sort(key=self.DAYS.get)
+    def matches(self, date):
+        """Return if the given date or datetime falls on one of these weekdays."""
+        return bool(self._bits & (1 << self.day_index(date)))
 
-    def remove(self, value):
-        value = self.as_attr(value)
-        if list.__contains__(self, value):
-            super().remove(value)
+    def mask(self, dates):
+        """Return a boolean array for which of the given dates fall on one of these weekdays.
+
+        The weekday computation is vectorized with numpy. If numpy is not installed a list of bools is returned.
+
+        Args:
+            dates (np.ndarray/list): numpy datetime64 array or list of dates, datetimes, or ISO date strings.
+
+        Returns:
+            mask (np.ndarray/list): Boolean array with the same shape as dates.
+        """
+        try:
+            import numpy as np
+        except (ImportError, Exception):
+            return [self.matches(d) for d in dates]
+
+        dates = np.asarray(dates)
+        if dates.dtype.kind != 'M':
+            dates = dates.astype('datetime64[D]')
+        days = dates.astype('datetime64[D]').astype(np.int64)
+
+        # Lookup table of DAYS index to valid and day 0 (1970-01-01) offset to the DAYS index
+        table = np.array([bool(self._bits & (1 << i)) for i in range(len(self.DAYS))])
+        mask = table[(days + _EPOCH_INDEX) % len(self.DAYS)]
+        mask[np.isnat(dates)] = False
+        return mask
+
+    def occurrences(self, start, end):
+        """Yield every date from start to end (inclusive) that falls on one of these weekdays.
+
+        Only the matching dates are visited. The gap to the next valid weekday is precomputed for every weekday.
+
+        Args:
+            start (datetime.date/datetime.datetime): First date to check.
+            end (datetime.date/datetime.datetime): Last date to check. This must be the same type as start.
+
+        Yields:
+            date (datetime.date/datetime.datetime): Date that falls on one of these weekdays.
+        """
+        bits = self._bits
+        if not bits:
+            return
+
+        num = len(self.DAYS)
+        gaps = [next(step for step in range(1, num + 1) if bits & (1 << ((i + step) % num))) for i in range(num)]
+        gaps = [datetime.timedelta(days=gap) for gap in gaps]
+
+        index = self.day_index(start)
+        if not bits & (1 << index):
+            current = start + gaps[index]
+        else:
+            current = start
+        index = self.day_index(current)
+
+        while current <= end:
+            yield current
+            current += gaps[index]
+            index = (index + gaps[index].days) % num
+
+    # ===== List API =====
+    def __iter__(self):
+        bits = self._bits
+        return (name for i, name in enumerate(self._NAMES) if bits & (1 << i))
+
+    def __reversed__(self):
+        return reversed(list(self))
+
+    def __len__(self):
+        return bin(self._bits).count('1')
+
+    def __bool__(self):
+        return self._bits != 0
 
     def __contains__(self, value):
+        if isinstance(value, str):
+            value = value.lower()
         try:
-            value = self.as_attr(value)
-            return super().__contains__(value)
+            return bool(self._bits & self._BITS.get(value, 0))
         except (TypeError, ValueError, Exception):
             return False
 
+    def __getitem__(self, index):
+        return list(self)[index]
+
     def __setitem__(self, key, value):
-        value = self.as_attr(value)
-        super().__setitem__(key, value)
-        self.sort(key=self.DAYS.get)
+        names = list(self)
+        if isinstance(key, slice):
+            names[key] = [self.as_attr(v) for v in value]
+        else:
+            names[key] = self.as_attr(value)
+        self._bits = self._other_bits(names)
+
+    def __delitem__(self, key):
+        names = list(self)
+        del names[key]
+        self._bits = self._other_bits(names)
+
+    def index(self, value, *args):
+        return list(self).index(self.as_attr(value), *args)
+
+    def count(self, value):
+        return int(value in self)
+
+    def append(self, value):
+        self._bits |= self.as_bit(value)
+
+    def insert(self, index, value):
+        self._bits |= self.as_bit(value)
+
+    def remove(self, value):
+        self._bits &= ~self.as_bit(value)
+
+    def pop(self, index=-1):
+        value = self[index]
+        self.remove(value)
+        return value
+
+    def clear(self):
+        self._bits = 0
+
+    def sort(self, *args, **kwargs):
+        """Weekdays are always sorted."""
+        pass
+
+    def copy(self):
+        return self.from_bits(self._bits)
 
     def extend(self, other):
         for n in other:
-            if self.is_attr(n):
-                n = self.as_attr(n)
-                if n not in self:
-                    self.append(n)
-        self.sort(key=self.DAYS.get)
+            self._bits |= self.as_bit(n, 0)
 
     def __add__(self, other):
         if isinstance(other, str):
             other = [other]
-        new_obj = self.__class__(*self)
+        new_obj = self.copy()
         new_obj.extend(other)
         return new_obj
 
     def __radd__(self, other):
         if isinstance(other, str):
             other = [other]
-        new_obj = self.__class__(*self)
+        new_obj = self.copy()
         new_obj.extend(other)
         return new_obj
 
@@ -251,3 +440,70 @@ class Weekdays(list):
             other = [other]
         self.extend(other)
         return self
+
+    # ===== Set API =====
+    def __or__(self, other):
+        try:
+            return self.from_bits(self._bits | self._other_bits(other))
+        except (TypeError, ValueError):
+            return NotImplemented
+
+    __ror__ = __or__
+
+    def __and__(self, other):
+        try:
+            return self.from_bits(self._bits & self._other_bits(other))
+        except (TypeError, ValueError):
+            return NotImplemented
+
+    __rand__ = __and__
+
+    def __sub__(self, other):
+        try:
+            return self.from_bits(self._bits & ~self._other_bits(other))
+        except (TypeError, ValueError):
+            return NotImplemented
+
+    def __rsub__(self, other):
+        try:
+            return self.from_bits(self._other_bits(other) & ~self._bits)
+        except (TypeError, ValueError):
+            return NotImplemented
+
+    def __ior__(self, other):
+        self._bits |= self._other_bits(other)
+        return self
+
+    def __iand__(self, other):
+        self._bits &= self._other_bits(other)
+        return self
+
+    def __isub__(self, other):
+        self._bits &= ~self._other_bits(other)
+        return self
+
+    def __eq__(self, other):
+        if isinstance(other, Weekdays):
+            return self._bits == other._bits
+        elif isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+    # ===== Serialization =====
+    def __getstate__(self):
+        return self._bits
+
+    def __setstate__(self, state):
+        if isinstance(state, dict):
+            self._bits = Weekdays(**state)._bits
+        elif isinstance(state, int):
+            self._bits = state & self.ALL_BITS
+        else:  # Old list of names format
+            self._bits = Weekdays(state)._bits
+
+
+# DAYS index of the numpy datetime64 day 0 (1970-01-01)
+_EPOCH_INDEX = Weekdays.day_index(datetime.date(1970, 1, 1))
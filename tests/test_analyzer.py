@@ -0,0 +1,63 @@
+
+
+def test_analyze():
+    import json
+    import datetime
+    import serial_json
+    from serial_json import DataClass
+
+    class Frame(DataClass):
+        name: str = ''
+        data: bytes = b''
+        date: datetime.date = None
+
+    obj = [Frame('café', bytes(range(200, 256)), datetime.date(2020, 1, 1)), {'x': [1, 2.5, None, True]}]
+    report = serial_json.analyze(obj)
+    assert report['total'] == len(serial_json.dumps(obj))
+    assert report['compact'] == len(json.dumps(serial_json.to_builtins(obj), separators=(',', ':')))
+    assert report['whitespace'] == report['total'] - report['compact']
+    assert report['escaping'] >= 56 * 4 + 4  # \u00XX for every latin1 byte >= 0x80 and the e with an accent
+    assert report['serializers']['bytes']['count'] == 1
+    assert report['serializers']['date']['count'] == 1
+    frame = report['serializers'][Frame.__qualname__]
+    assert frame['self_bytes'] == frame['bytes'] - report['serializers']['bytes']['bytes'] - \
+        report['serializers']['date']['bytes']
+    assert report['fields']['Frame.data'] > report['fields']['Frame.name']
+    assert report['tags'] > len('"SERIALIZER_TYPE":"Frame"') + len('"SERIALIZER_TYPE":"date"')
+
+    # Compact options remove the whitespace and escaping
+    report = serial_json.analyze({'text': 'café'}, separators=(',', ':'), ensure_ascii=False)
+    assert report['whitespace'] == 0
+    assert report['escaping'] == 0
+
+    report = serial_json.analyze({'a': 1}, indent=4)
+    assert report['whitespace'] == len('\n    ') + len(' ') + len('\n')
+
+
+def test_analyzer_cli():
+    import io
+    import os
+    import tempfile
+    import contextlib
+    import serial_json
+    from serial_json.analyzer import main
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, 'sample.jsonl')
+        with open(filename, 'w') as f:
+            for i in range(3):
+                f.write(serial_json.dumps({'i': i, 'data': b'\xff' * 10}) + '\n')
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            assert main([filename, '--lines']) == 0
+        text = out.getvalue()
+        assert 'escaping' in text
+        assert 'bytes' in text
+
+
+if __name__ == '__main__':
+    test_analyze()
+    test_analyzer_cli()
+
+    print('All tests finished successfully!')
@@ -8,7 +8,129 @@ def test_bytes():
     assert serial_json.loads(serial_json.dumps(bts)) == bts
 
 
+def test_binary_encodings():
+    import serial_json
+    import serial_json.bytes_support as bytes_support
+
+    bts = bytes(range(256)) * 4
+    try:
+        for encoding in bytes_support.BINARY_ENCODINGS:
+            bytes_support.set_binary_encoding(encoding)
+            text = serial_json.dumps(bts)
+            if encoding != 'latin1':
+                assert '"encoding": "{}"'.format(encoding) in text
+                assert len(text) < len(bts) * 3
+
+            assert serial_json.loads(text) == bts
+
+            obj = serial_json.loads(serial_json.dumps(bytearray(bts)))
+            assert isinstance(obj, bytearray)
+            assert obj == bts
+
+            obj = serial_json.loads(serial_json.dumps(memoryview(bts)))
+            assert isinstance(obj, memoryview)
+            assert obj == bts
+    finally:
+        bytes_support.set_binary_encoding('latin1')
+
+    # Legacy latin1 data still decodes
+    assert serial_json.loads('{"SERIALIZER_OBJ": "\\u00ff\\u0000a", "SERIALIZER_TYPE": "bytes"}') == b'\xff\x00a'
+
+
+def test_bytes_compression():
+    import random
+    import serial_json
+    import serial_json.bytes_support as bytes_support
+
+    bts = b'12345' * 1000
+    try:
+        for compression in bytes_support.COMPRESSORS:
+            bytes_support.set_compression(compression, threshold=1024)
+            text = serial_json.dumps(bts)
+            assert '"compression": "{}"'.format(compression) in text
+            assert len(text) < len(bts)
+            assert serial_json.loads(text) == bts
+            assert serial_json.loads(serial_json.dumps(bytearray(bts))) == bytearray(bts)
+
+            # Small values are not compressed
+            assert serial_json.dumps(b'123') == '{"SERIALIZER_OBJ": "123", "SERIALIZER_TYPE": "bytes"}'
+
+            # Data that does not compress is not compressed
+            rnd = random.Random(1234)
+            random_bts = bytes(rnd.getrandbits(8) for _ in range(4096))
+            assert '"compression"' not in serial_json.dumps(random_bts)
+            assert serial_json.loads(serial_json.dumps(random_bts)) == random_bts
+    finally:
+        bytes_support.set_compression(None)
+
+
+def test_buffer_protocol():
+    import array
+    import serial_json
+    import serial_json.bytes_support as bytes_support
+
+    arr = array.array('d', [1.5, 2.5, -3.0])
+    obj = serial_json.loads(serial_json.dumps(arr))
+    assert isinstance(obj, array.array)
+    assert obj.typecode == 'd'
+    assert obj == arr
+
+    # Swapped byte order
+    data = bytes_support.array_encode(arr)
+    data['byteorder'] = 'big' if data['byteorder'] == 'little' else 'little'
+    arr.byteswap()
+    assert bytes_support.array_decode(data) == arr
+
+    # Decode into a preallocated buffer
+    bts = bytes(range(256))
+    for encoding in bytes_support.BINARY_ENCODINGS:
+        with serial_json.serial_context(binary_encoding=encoding):
+            data = bytes_support.bytes_encode(bts)
+        out = bytearray(300)
+        assert bytes_support.decode_into(data, out) == len(bts)
+        assert out[:len(bts)] == bts
+
+    # Tagged bytes from loads(tagged=False)
+    for encoding in bytes_support.BINARY_ENCODINGS:
+        with serial_json.serial_context(binary_encoding=encoding):
+            state = serial_json.loads(serial_json.dumps({'data': bts}), tagged=False)
+        out = array.array('B', bytes(256))
+        assert bytes_support.decode_into(state['data'], out) == len(bts)
+        assert out.tobytes() == bts
+
+    out = array.array('B', bytes(10))
+    try:
+        bytes_support.decode_into(bytes_support.bytes_encode(bts), out)
+        raise AssertionError('A buffer that is too small should raise a ValueError')
+    except ValueError:
+        pass
+
+    # Decompress into a preallocated buffer in several chunks
+    bts = bytes(range(256)) * 64
+    chunk_size = bytes_support.DECOMPRESS_CHUNK_SIZE
+    bytes_support.DECOMPRESS_CHUNK_SIZE = 1000
+    try:
+        for compression in bytes_support.COMPRESSORS:
+            with serial_json.serial_context(compression=compression, compression_threshold=1024):
+                data = bytes_support.bytes_encode(bts)
+            assert data['compression'] == compression
+            out = bytearray(len(bts) + 10)
+            assert bytes_support.decode_into(data, out) == len(bts)
+            assert out[:len(bts)] == bts
+
+            try:
+                bytes_support.decode_into(data, bytearray(len(bts) - 1))
+                raise AssertionError('A buffer that is too small should raise a ValueError')
+            except ValueError:
+                pass
+    finally:
+        bytes_support.DECOMPRESS_CHUNK_SIZE = chunk_size
+
+
 if __name__ == '__main__':
     test_bytes()
+    test_binary_encodings()
+    test_bytes_compression()
+    test_buffer_protocol()
 
     print('All tests finished successfully!')
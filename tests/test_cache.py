@@ -0,0 +1,92 @@
+
+
+def test_cached_loader():
+    import datetime
+    import serial_json
+    from serial_json.cache import CachedLoader
+
+    value = {'name': 'config', 'values': [1, 2, {'a': 3}], 'date': datetime.date(2020, 1, 1)}
+    text = serial_json.dumps(value)
+
+    cache = CachedLoader()
+    obj = cache.loads(text)
+    assert obj == value
+    assert cache.info()['misses'] == 1
+
+    obj2 = cache.loads(text)
+    assert obj2 == value
+    assert obj2 is not obj
+    assert obj2['values'] is not obj['values']
+    obj2['values'].append(4)
+    assert cache.loads(text.encode('utf-8'))['values'] == [1, 2, {'a': 3}]  # str and bytes use the same key
+    assert cache.hits == 2
+    assert cache.hit_rate == 2 / 3
+
+    # Shared results are read only
+    cache = CachedLoader(policy='shared')
+    obj = cache(text)
+    assert cache(text) is obj
+    assert obj == {'name': 'config', 'values': (1, 2, {'a': 3}), 'date': datetime.date(2020, 1, 1)}
+    for mutate in (lambda: obj.__setitem__('name', 'changed'), lambda: obj['values'].append(4),
+                   lambda: obj['values'][2].__setitem__('a', 4)):
+        try:
+            mutate()
+            raised = False
+        except (TypeError, AttributeError):
+            raised = True
+        assert raised, 'Shared results should not be modifiable'
+    assert cache(text)['values'][2]['a'] == 3
+
+    # Bounded by entries and bytes
+    cache = CachedLoader(maxsize=2, maxbytes=30)
+    cache.loads('[1, 2]')
+    cache.loads('[3, 4]')
+    cache.loads('[1, 2]')
+    cache.loads('[5, 6]')  # Drops the least recently used [3, 4]
+    assert len(cache) == 2
+    cache.loads('[3, 4]')
+    assert cache.misses == 4
+
+    cache.loads('"' + 'x' * 100 + '"')  # Larger than maxbytes
+    assert len(cache) == 2
+    cache.loads('"' + 'x' * 20 + '"')
+    assert len(cache) == 2 and cache.nbytes == 6 + 22
+
+    cache.clear()
+    assert cache.info()['currsize'] == 0 and cache.hits == 0
+
+    try:
+        CachedLoader(policy='frozen')
+        raise AssertionError('Invalid policy should raise a ValueError')
+    except ValueError:
+        pass
+
+
+def test_cached_loader_shared_array():
+    try:
+        import numpy as np
+    except ImportError:
+        return
+    import serial_json
+    import serial_json.bytes_support   # Not needed in normal use
+    import serial_json.numpy_support   # Not needed in normal use
+    from serial_json.cache import CachedLoader
+
+    text = serial_json.dumps({'array': np.arange(10)})
+    cache = CachedLoader(policy='shared')
+    arr = cache(text)['array']
+    assert not arr.flags.writeable
+    try:
+        arr[0] = 100
+        raised = False
+    except ValueError:
+        raised = True
+    assert raised, 'Shared arrays should be read only'
+    assert cache(text)['array'][0] == 0
+
+
+if __name__ == '__main__':
+    test_cached_loader()
+    test_cached_loader_shared_array()
+
+    print('All tests finished successfully!')
@@ -412,6 +412,58 @@ def test_dataclass_json():
     assert m3 == m2
 
 
+def test_dataclass_loads_into():
+    import datetime
+    from serial_json import DataClass, dumps, loads_into
+
+    class Quote(DataClass):
+        bid: float = 0.0
+        ask: float = 0.0
+
+    class Tick(DataClass):
+        symbol: str = ''
+        quote: Quote = Quote()
+        time: datetime.datetime = None
+        tags: list = []
+
+    tick = Tick('ABC', Quote(1.0, 1.5))
+    quote = tick.quote
+
+    text = dumps(Tick('ABC', Quote(2.0, 2.5), datetime.datetime(2020, 1, 1, 9, 30), ['a']))
+    assert tick.update_from_json(text) is tick
+    assert tick.quote is quote  # Nested objects are updated in place
+    assert quote.bid == 2.0 and quote.ask == 2.5
+    assert tick.time == datetime.datetime(2020, 1, 1, 9, 30)
+    assert tick.tags == ['a']
+
+    # Fields missing from the state are reset to the default like loads
+    text = dumps({'symbol': 'XYZ', 'SERIALIZER_TYPE': Tick.__qualname__})
+    loads_into(tick, text)
+    assert tick.symbol == 'XYZ' and tick.quote == Quote() and tick.time is None
+
+    # A different nested type replaces the field
+    tick.quote = {'bid': 1}
+    loads_into(tick, dumps(Tick('ABC', Quote(3.0, 3.5))))
+    assert isinstance(tick.quote, Quote) and tick.quote.bid == 3.0
+
+    try:
+        loads_into(quote, text)
+        raise AssertionError('Decoding into a different type should raise a TypeError')
+    except TypeError:
+        pass
+
+    # Out of band buffers are available while the state is decoded
+    class Blob(DataClass):
+        data: bytes = b''
+
+    buffers = []
+    text = dumps(Blob(b'abc'), buffer_callback=buffers.append)
+    assert len(buffers) == 1
+    blob = Blob()
+    assert loads_into(blob, text, buffers=buffers) is blob
+    assert blob.data == b'abc'
+
+
 if __name__ == '__main__':
     test_dataclass_func()
     test_dataclass_property()
@@ -422,5 +474,6 @@ if __name__ == '__main__':
     test_dataclass_serial_json()
     test_dataclass_nested()
     test_dataclass_json()
+    test_dataclass_loads_into()
 
     print('All tests finished successfully!')
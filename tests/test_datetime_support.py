@@ -46,10 +46,78 @@ def test_dataclass_datetime_property():
     assert rec.created_on > before
 
 
+def test_parse_cache():
+    import datetime
+    import serial_json.datetime_support as dts
+
+    dts.set_parse_cache(True)
+    dts.clear_parse_cache()
+    d1 = dts.make_datetime('2020-01-03 01:40:50')
+    d2 = dts.make_datetime('2020-01-03 01:40:50')
+    assert d1 == d2 == datetime.datetime(2020, 1, 3, 1, 40, 50)
+    assert d1 is d2
+    info = dts.parse_cache_info()
+    assert info['hits'] == 1 and info['misses'] == 1 and info['currsize'] == 1
+
+    # Formats are part of the key
+    assert dts.make_date('2020-01-03', formats=['%Y-%m-%d']) == datetime.date(2020, 1, 3)
+    assert dts.make_time('01:40 PM') == datetime.time(13, 40)
+    assert dts.parse_cache_info()['currsize'] == 3
+
+    # Bounded size
+    dts.set_parse_cache(True, maxsize=2)
+    assert dts.parse_cache_info()['currsize'] == 2
+    dts.make_time('01:41 PM')
+    assert dts.parse_cache_info()['currsize'] == 2
+
+    # Disabled
+    dts.set_parse_cache(False)
+    assert dts.make_datetime('2020-01-03 01:40:50') is not dts.make_datetime('2020-01-03 01:40:50')
+    assert dts.parse_cache_info()['currsize'] == 0
+
+    dts.set_parse_cache(True, maxsize=1024)
+
+    # The formats key is built once per list and rebuilt when the list grows
+    assert dts._formats_key(dts.DATETIME_FORMATS) is dts._formats_key(dts.DATETIME_FORMATS)
+    formats = ['%Y-%m-%d']
+    key = dts._formats_key(formats)
+    formats.append('%m/%d/%Y')
+    assert dts._formats_key(formats) is not key
+    assert dts.make_date('01/03/2020', formats=formats) == datetime.date(2020, 1, 3)
+
+
+def test_compiled_formats():
+    import datetime
+    from serial_json.datetime_support import DATETIME_FORMATS, compile_format, strptime
+
+    dt = datetime.datetime(2019, 4, 17, 14, 24, 55, 200)
+    for fmt in DATETIME_FORMATS:
+        text = dt.strftime(fmt)
+        for value in (text, text.upper(), text.lower(), text + ' ', text[:-1]):
+            try:
+                expected = datetime.datetime.strptime(value, fmt)
+            except ValueError:
+                expected = None
+            try:
+                parsed = strptime(value, fmt)
+            except ValueError:
+                parsed = None
+            assert parsed == expected, '{} {}'.format(value, fmt)
+
+    # 12 hour clock without AM/PM matches strptime
+    assert strptime('12:05', '%I:%M') == datetime.datetime.strptime('12:05', '%I:%M')
+
+    # Unsupported directives fall back to strptime
+    assert compile_format('%j %Y')('108 2019') == datetime.datetime(2019, 4, 18)
+    assert compile_format('%Y-%m-%d') is compile_format('%Y-%m-%d')
+
+
 if __name__ == '__main__':
     test_date()
     test_time()
     test_datetime()
     test_dataclass_datetime_property()
+    test_parse_cache()
+    test_compiled_formats()
 
     print('All tests finished successfully!')
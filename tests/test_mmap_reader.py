@@ -0,0 +1,77 @@
+
+
+def test_json_lines_file():
+    import os
+    import tempfile
+    import datetime
+    import serial_json
+    from serial_json.mmap_reader import JsonLinesFile, build_line_index, _build_line_index_py
+
+    records = [{'i': i, 'date': datetime.date(2020, 1, 1) + datetime.timedelta(days=i)} for i in range(100)]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, 'records.jsonl')
+        with open(filename, 'w') as f:
+            for rec in records:
+                f.write(serial_json.dumps(rec) + '\n')
+            f.write('\n')  # Blank lines are skipped
+            f.write('  \t\r\n')  # Whitespace only lines are skipped
+
+        with JsonLinesFile(filename) as file:
+            assert len(file) == 100
+            assert file[0] == records[0]
+            assert file[-1] == records[-1]
+            assert isinstance(file[5]['date'], datetime.date)
+            assert file[10:20] == records[10:20]
+            assert file[::-25] == records[::-25]
+            assert list(file.iter_range(95)) == records[95:]
+            assert list(file) == records
+
+            try:
+                file[100]
+                raise AssertionError('Index out of range should raise an IndexError')
+            except IndexError:
+                pass
+
+        # Saved index
+        with JsonLinesFile(filename, index_file=True) as file:
+            assert len(file) == 100
+        assert os.path.exists(filename + '.idx')
+        with JsonLinesFile(filename, index_file=True) as file:
+            assert file[50] == records[50]
+
+        # Index is rebuilt when the file changes
+        with open(filename, 'a') as f:
+            f.write('{"i": 100}')  # No trailing newline
+        with JsonLinesFile(filename, index_file=True) as file:
+            assert len(file) == 101
+            assert file[-1] == {'i': 100}
+
+    # Lines across chunk boundaries
+    data = b'1\n22\r\n\n333\n4444'
+    assert list(build_line_index(data, chunk_size=3)) == [0, 2, 7, 11]
+
+    # Whitespace only lines are skipped like in parallel.load_range, with and without numpy
+    data = b' \n\t1 \n  \r\n\n 22\n   \n  '
+    expected = [2, 11]
+    for chunk_size in range(1, len(data) + 2):
+        assert list(build_line_index(data, chunk_size=chunk_size)) == expected
+        assert list(_build_line_index_py(data, chunk_size)) == expected
+
+
+def time_build_line_index(num_lines=1000000):
+    import timeit
+    from serial_json.mmap_reader import build_line_index, _build_line_index_py
+
+    data = b'{"i": 12345, "name": "some record value", "values": [1, 2, 3]}\n' * num_lines
+    t1 = timeit.timeit(lambda: build_line_index(data), number=1)
+    print('build_line_index: ', t1, '({:.0f} MB/s)'.format(len(data) / t1 / 1e6))
+    t2 = timeit.timeit(lambda: _build_line_index_py(data, 1 << 24), number=1)
+    print('build_line_index without numpy: ', t2, '({:.0f} MB/s)'.format(len(data) / t2 / 1e6))
+
+
+if __name__ == '__main__':
+    test_json_lines_file()
+
+    time_build_line_index()
+
+    print('All tests finished successfully!')
@@ -55,6 +55,315 @@ def test_np_recarray():
     assert obj.shape == n.shape
 
 
+def test_np_binary_encoding():
+    import numpy as np
+    import serial_json
+    import serial_json.bytes_support as bytes_support
+    import serial_json.numpy_support   # Not needed in normal use
+
+    n = np.random.random((10, 20)).astype('<f4')
+    try:
+        for encoding in bytes_support.BINARY_ENCODINGS:
+            bytes_support.set_binary_encoding(encoding)
+            obj = serial_json.loads(serial_json.dumps(n))
+            assert type(obj) == type(n)
+            assert np.all(obj == n)
+            assert obj.dtype == n.dtype
+            assert obj.shape == n.shape
+    finally:
+        bytes_support.set_binary_encoding('latin1')
+
+
+def test_np_frombuffer():
+    import json
+    import numpy as np
+    import serial_json
+    import serial_json.bytes_support   # Not needed in normal use
+    import serial_json.numpy_support as numpy_support
+
+    # Fortran order is kept without a contiguous copy
+    n = np.asfortranarray(np.arange(12, dtype='<i4').reshape(3, 4))
+    text = serial_json.dumps(n)
+    assert '"order": "F"' in text
+    obj = serial_json.loads(text)
+    assert np.all(obj == n)
+    assert obj.flags.f_contiguous
+    assert obj.flags.writeable
+
+    # Non contiguous and 0-d arrays
+    n = np.arange(24).reshape(2, 3, 4)[:, ::2]
+    assert np.all(serial_json.loads(serial_json.dumps(n)) == n)
+    n = np.array(1.5)
+    obj = serial_json.loads(serial_json.dumps(n))
+    assert obj.shape == () and obj == n
+
+    # Default latin1 data is inline and decodes into a writable buffer without another copy
+    n = np.arange(100, dtype='<f8')
+    text = serial_json.dumps(n)
+    assert '"encoding": "latin1"' in text and 'SERIALIZER_TYPE": "bytes' not in text
+    obj = serial_json.loads(text)
+    assert np.all(obj == n)
+    assert obj.flags.writeable
+    base = obj
+    while isinstance(base, np.ndarray):
+        base = base.base
+    assert isinstance(getattr(base, 'obj', base), bytearray)  # View of the decoded bytearray, not a copy
+
+    # Legacy nested bytes data still decodes
+    legacy = text.replace('"encoding": "latin1", ', '').replace(
+        '"data": ' + json.dumps(n.tobytes().decode('latin1')),
+        '"data": {"SERIALIZER_OBJ": ' + json.dumps(n.tobytes().decode('latin1')) + ', "SERIALIZER_TYPE": "bytes"}')
+    assert '"SERIALIZER_TYPE": "bytes"' in legacy
+    obj = serial_json.loads(legacy)
+    assert np.all(obj == n)
+    assert obj.flags.writeable
+
+    # Read only views
+    arr = numpy_support.np_from_dict({'data': b'\x01\x00\x00\x00', 'shape': '1', 'dtype': '<i4'}, readonly=True)
+    assert arr[0] == 1
+    assert not arr.flags.writeable
+
+
+def test_np_out_of_band():
+    import numpy as np
+    import serial_json
+    import serial_json.bytes_support   # Not needed in normal use
+    import serial_json.numpy_support   # Not needed in normal use
+
+    n = np.random.random((100, 50))
+    f = np.asfortranarray(n)
+    buffers = []
+    text = serial_json.dumps([n, f], buffer_callback=buffers.append)
+    assert len(text) < 300
+    assert len(buffers) == 2
+
+    buffers = [bytearray(buf) for buf in buffers]
+    obj = serial_json.loads(text, buffers=buffers)
+    assert np.all(obj[0] == n)
+    assert np.all(obj[1] == f)
+    assert np.shares_memory(obj[0], np.frombuffer(buffers[0], dtype=np.uint8))  # Zero copy
+
+
+def test_np_sidecar_files():
+    import os
+    import json
+    import tempfile
+    import numpy as np
+    import serial_json
+    import serial_json.bytes_support   # Not needed in normal use
+    import serial_json.numpy_support   # Not needed in normal use
+
+    large = np.random.random((100, 100))
+    small = np.arange(3, dtype='<i4')
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, 'doc.json')
+        with open(filename, 'w') as f:
+            serial_json.dump({'large': large, 'small': small}, f, sidecar_threshold=1024)
+
+        assert sorted(os.listdir(tmp)) == ['doc.json', 'doc.json.0.npy']
+        with open(filename) as f:
+            assert '"npy": "doc.json.0.npy"' in f.read()
+
+        with open(filename) as f:
+            obj = serial_json.load(f)
+        assert isinstance(obj['large'], np.memmap)
+        assert np.all(obj['large'] == large)
+        assert np.all(obj['small'] == small)
+        del obj
+
+        # Sidecar names must be plain file names in the directory of the json file
+        with open(filename) as f:
+            text = f.read()
+        os.mkdir(os.path.join(tmp, 'sub'))
+        for name in ('../doc.json.0.npy', os.path.join(tmp, 'doc.json.0.npy'), 'sub/../doc.json.0.npy', '..'):
+            bad = text.replace('"doc.json.0.npy"', json.dumps(name))
+            with serial_json.serial_context(sidecar_dir=os.path.join(tmp, 'sub')):
+                try:
+                    serial_json.loads(bad)
+                    raised = False
+                except ValueError:
+                    raised = True
+            assert raised, 'Sidecar file name {} should raise a ValueError'.format(name)
+
+        # loads does not know the json file directory
+        try:
+            serial_json.loads(text)
+            raised = False
+        except ValueError:
+            raised = True
+        assert raised, 'A sidecar file without a sidecar_dir should raise a ValueError'
+        with serial_json.serial_context(sidecar_dir=tmp):
+            obj = serial_json.loads(text)
+        assert np.all(obj['large'] == large)
+        del obj
+
+
+def test_np_compression():
+    import numpy as np
+    import serial_json
+    import serial_json.bytes_support as bytes_support
+    import serial_json.numpy_support   # Not needed in normal use
+
+    rng = np.random.RandomState(1234)
+    n = np.cumsum(rng.randn(100000) * 0.01).astype('<f4')
+    plain = serial_json.dumps(n)
+    for compression in bytes_support.COMPRESSORS:
+        for shuffle in (True, False):
+            with serial_json.serial_context(compression=compression, compression_threshold=1024, shuffle=shuffle):
+                text = serial_json.dumps(n)
+            assert '"compression": "{}"'.format(compression) in text
+            assert ('"shuffle": true' in text) == shuffle
+            assert '"encoding": "base64"' in text  # Compressed data is never latin1
+            assert len(text) < len(plain)
+            if shuffle:
+                assert len(text) < n.nbytes
+
+            obj = serial_json.loads(text)
+            assert np.all(obj == n)
+            assert obj.dtype == n.dtype
+            assert obj.flags.writeable
+            if not shuffle:
+                # Decompressed straight into the array buffer without a copy
+                assert isinstance(obj.base, np.ndarray) and obj.base.dtype == np.uint8
+
+    # Below the threshold
+    with serial_json.serial_context(compression='zlib', compression_threshold=n.nbytes + 1):
+        assert serial_json.dumps(n) == plain
+
+    # Data that does not compress is not compressed
+    n = rng.randint(0, 256, 10000).astype('u1')
+    with serial_json.serial_context(compression='zlib', compression_threshold=1024):
+        text = serial_json.dumps(n)
+    assert '"compression"' not in text
+    assert np.all(serial_json.loads(text) == n)
+
+
+def test_np_stream_dump():
+    import io
+    import numpy as np
+    import serial_json
+    import serial_json.bytes_support   # Not needed in normal use
+    import serial_json.numpy_support   # Not needed in normal use
+
+    n = np.random.random(50000)
+    value = {'array': n, 'other': [1, 2]}
+    for encoding in ('latin1', 'base64', 'base85', 'hex'):
+        with serial_json.serial_context(binary_encoding=encoding, stream_threshold=1024):
+            chunks = list(serial_json.iterencode(value))
+            assert max(len(c) for c in chunks) < n.nbytes  # Array is written in chunks
+            assert ''.join(chunks) == serial_json.dumps(value)
+
+            fp = io.StringIO()
+            serial_json.dump(value, fp, indent=2)
+            assert fp.getvalue() == serial_json.dumps(value, indent=2)
+
+        obj = serial_json.loads(fp.getvalue())
+        assert np.all(obj['array'] == n)
+        assert obj['other'] == [1, 2]
+
+
+def test_np_dtype_cache():
+    import numpy as np
+    import serial_json
+    import serial_json.bytes_support   # Not needed in normal use
+    from serial_json.numpy_support import _parse_dtype
+
+    assert _parse_dtype('<f4') == np.dtype('<f4')
+    assert _parse_dtype('float64') == np.dtype('float64')
+    assert _parse_dtype("[('a', '<i4'), ('b', '<f4')]") == np.dtype([('a', '<i4'), ('b', '<f4')])
+    assert _parse_dtype('<f4') is _parse_dtype('<f4')
+
+    n = np.zeros(2, dtype=[('a', '<i4'), ('b', '<f8')])
+    text = serial_json.dumps(n)
+    serial_json.loads(text)
+    hits = _parse_dtype.cache_info().hits
+    for _ in range(5):
+        assert np.all(serial_json.loads(text) == n)
+    assert _parse_dtype.cache_info().hits >= hits + 5
+
+
+def test_np_scalars():
+    import numpy as np
+    import serial_json
+    import serial_json.bytes_support   # Not needed in normal use
+    import serial_json.numpy_support   # Not needed in normal use
+
+    values = [np.int64(5), np.float32(1.5), np.bool_(True), np.uint8(3), np.datetime64('2020-01-02T03:04'),
+              np.complex64(1 + 2j)]
+    assert serial_json.dumps(values) == '[5, 1.5, true, 3, "2020-01-02T03:04", [1.0, 2.0]]'
+
+    with serial_json.serial_context(exact_scalars=True):
+        text = serial_json.dumps(values)
+    for value, obj in zip(values, serial_json.loads(text)):
+        assert type(obj) == type(value)
+        assert obj == value
+
+    # 0-d arrays
+    n = np.array(2.5, dtype='<f4')
+    obj = serial_json.loads(serial_json.dumps(n))
+    assert isinstance(obj, np.ndarray) and obj.shape == () and obj == n
+
+
+def test_np_small_list():
+    import numpy as np
+    import serial_json
+    import serial_json.bytes_support   # Not needed in normal use
+    import serial_json.numpy_support   # Not needed in normal use
+
+    small = np.arange(6, dtype='<f4').reshape(2, 3)
+    large = np.arange(100, dtype='<i4')
+    with serial_json.serial_context(list_threshold=10):
+        text = serial_json.dumps([small, large])
+    assert '"list": [[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]]' in text
+    assert text.count('"list"') == 1
+
+    obj = serial_json.loads(text)
+    assert obj[0].dtype == small.dtype and obj[0].shape == small.shape and np.all(obj[0] == small)
+    assert np.all(obj[1] == large)
+
+
+def test_np_object_fields():
+    import json
+    import numpy as np
+    import serial_json
+    import serial_json.bytes_support   # Not needed in normal use
+    import serial_json.numpy_support   # Not needed in normal use
+
+    dtype = np.dtype([('a', '<i4'), ('b', '<f4'), ('d', '|O')])
+    n = np.array([(1, 2.3, 'abc'), (5, 6.7, [1, 2])], dtype=dtype)
+    text = serial_json.dumps(n)
+    assert json.loads(text)['objects'] == {'d': ['abc', [1, 2]]}  # Objects are values not pointers
+
+    obj = serial_json.loads(text)
+    assert obj.dtype == n.dtype
+    assert np.all(obj['a'] == n['a'])
+    assert np.all(obj['b'] == n['b'])
+    assert list(obj['d']) == ['abc', [1, 2]]
+
+    # Object arrays
+    n = np.array([[1, 'x'], [None, 2.5]], dtype=object)
+    obj = serial_json.loads(serial_json.dumps(n))
+    assert obj.dtype == n.dtype and obj.shape == n.shape
+    assert obj.tolist() == n.tolist()
+
+    # Object sub-array fields
+    n = np.zeros(3, dtype=np.dtype([('a', '<i4'), ('o', 'O', (2,))]))
+    n['a'] = [1, 2, 3]
+    n['o'] = [['x', [1, 2]], [None, 'y'], [3.5, 'z']]
+    obj = serial_json.loads(serial_json.dumps(n))
+    assert obj.dtype == n.dtype
+    assert obj['a'].tolist() == [1, 2, 3]
+    assert obj['o'].tolist() == [['x', [1, 2]], [None, 'y'], [3.5, 'z']]
+
+    # Object fields in nested structures are not supported
+    n = np.zeros(2, dtype=np.dtype([('a', '<i4'), ('s', [('o', 'O')])]))
+    try:
+        serial_json.dumps(n)
+        raise AssertionError('Nested object fields should raise a TypeError')
+    except TypeError:
+        pass
+
+
 def time_numpy_array(test_runs=1000):
     import timeit
     import numpy as np
@@ -183,6 +492,16 @@ if __name__ == '__main__':
     test_ndarray()
     test_np_structured_array()
     test_np_recarray()
+    test_np_binary_encoding()
+    test_np_frombuffer()
+    test_np_out_of_band()
+    test_np_sidecar_files()
+    test_np_compression()
+    test_np_stream_dump()
+    test_np_dtype_cache()
+    test_np_scalars()
+    test_np_small_list()
+    test_np_object_fields()
 
     time_numpy_array()
     time_np_recarray()
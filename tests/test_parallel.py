@@ -0,0 +1,79 @@
+import serial_json
+
+
+class ParallelPoint(object):
+    def __init__(self, x=0, y=0):
+        self.x = x
+        self.y = y
+
+
+# Lambdas cannot be pickled, so workers import this module to register the serializer again
+serial_json.register(ParallelPoint, lambda p: {'x': p.x, 'y': p.y}, lambda d: ParallelPoint(d['x'], d['y']))
+
+
+def decode_point(text):
+    from serial_json.parallel import ensure_registry
+    ensure_registry()
+
+    obj = serial_json.loads(text)
+    return type(obj).__name__, obj.x, obj.y
+
+
+def test_registry_spec():
+    import pickle
+    import datetime
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from serial_json.parallel import export_registry, load_registry, pool_initializer, callable_ref
+
+    spec = export_registry()
+    assert pickle.loads(pickle.dumps(spec)) == spec
+    entries = {entry['cls']: entry for entry in spec}
+    assert entries['datetime:date']['encode'] == 'serial_json.datetime_support:date_encode'
+    assert entries[callable_ref(ParallelPoint)]['import_only']
+    assert callable_ref(lambda: None) is None
+
+    load_registry(spec)  # Rebuilding the same registry keeps it working
+    assert serial_json.loads(serial_json.dumps(datetime.date(2020, 1, 1))) == datetime.date(2020, 1, 1)
+
+    text = serial_json.dumps(ParallelPoint(1, 2))
+    ctx = multiprocessing.get_context('spawn')  # New interpreters that do not inherit the registry
+    for lazy in (False, True):
+        with ProcessPoolExecutor(2, mp_context=ctx, **pool_initializer(spec, lazy=lazy)) as pool:
+            assert list(pool.map(decode_point, [text] * 4)) == [('ParallelPoint', 1, 2)] * 4
+
+
+def test_load_lines():
+    import os
+    import tempfile
+    import datetime
+    import multiprocessing
+    from serial_json.parallel import line_ranges, load_lines
+
+    records = [{'i': i, 'date': datetime.date(2020, 1, 1) + datetime.timedelta(days=i), 'text': 'x' * (i % 7)}
+               for i in range(500)]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'records.jsonl')
+        with open(path, 'w') as f:
+            for rec in records:
+                f.write(serial_json.dumps(rec) + '\n')
+
+        ranges = line_ranges(path, chunk_size=1000)
+        assert ranges[0][0] == 0 and ranges[-1][1] == os.path.getsize(path)
+        assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+        with open(path, 'rb') as f:
+            data = f.read()
+        assert all(data[end - 1: end] == b'\n' for _, end in ranges)
+
+        ctx = multiprocessing.get_context('spawn')
+        assert list(load_lines(path, workers=2, chunk_size=1000, max_pending=3, mp_context=ctx)) == records
+
+        unordered = list(load_lines(path, workers=2, ordered=False, chunk_size=1000, mp_context=ctx))
+        assert sorted(unordered, key=lambda rec: rec['i']) == records
+
+
+if __name__ == '__main__':
+    test_registry_spec()
+    test_load_lines()
+
+    print('All tests finished successfully!')
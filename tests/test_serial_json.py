@@ -58,11 +58,298 @@ def test_datetime():
     assert json.loads(json.dumps(d)) == d
 
 
+def test_out_of_band_buffers():
+    import io
+    import serial_json as json
+
+    value = {'a': b'12345' * 100, 'b': bytearray(b'abc'), 'c': [b'xyz']}
+    buffers = []
+    text = json.dumps(value, buffer_callback=buffers.append)
+    assert len(buffers) == 3
+    assert '{"buffer": 0, "SERIALIZER_TYPE": "bytes"}' in text
+    assert json.loads(text, buffers=buffers) == value
+
+    # Callback returning True keeps the buffer in band
+    assert json.loads(json.dumps(value, buffer_callback=lambda buf: True)) == value
+
+    # Sidecar file
+    fp = io.BytesIO()
+    json.write_buffers(fp, buffers)
+    assert json.loads(text, buffers=json.read_buffers(fp.getvalue())) == value
+
+    try:
+        json.loads(text)
+        raise AssertionError('Missing buffers should raise an error')
+    except ValueError:
+        pass
+
+
+def test_registry_snapshot():
+    import threading
+    import serial_json as json
+    from serial_json import interface
+
+    class Base(object):
+        def __init__(self, x=0):
+            self.x = x
+
+        def __getstate__(self):
+            return {'x': self.x}
+
+        def __setstate__(self, state):
+            self.x = state['x']
+
+    class Sub(Base):
+        pass
+
+    json.register(Base)
+    try:
+        assert json.get_serializer(Sub).cls is Base  # Subclass lookup is cached in the snapshot
+        assert json.get_serializer(Sub()).cls is Base
+        snapshot = interface.SERIALIZERS
+
+        json.register(Sub)  # New snapshot clears the subclass cache
+        assert json.get_serializer(Sub).cls is Sub
+        assert json.get_serializer('test_registry_snapshot.<locals>.Sub').cls is Sub
+        assert interface.SERIALIZERS is not snapshot
+        assert Sub not in [ser.cls for ser in snapshot]  # Old snapshots never change
+    finally:
+        json.unregister(Sub)
+        json.unregister(Base)
+    assert json.get_serializer(Sub) is None
+
+    # Register from worker threads while other threads encode
+    errors = []
+    classes = [type('Plugin{}'.format(i), (Base,), {}) for i in range(50)]
+
+    def register_plugins():
+        for cls in classes:
+            json.register(cls)
+
+    def encode():
+        try:
+            for _ in range(200):
+                obj = json.loads(json.dumps({'a': b'123', 'b': [1, 2.5]}))
+                assert obj == {'a': b'123', 'b': [1, 2.5]}
+        except Exception as err:
+            errors.append(err)
+
+    threads = [threading.Thread(target=register_plugins)] + [threading.Thread(target=encode) for _ in range(4)]
+    try:
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        assert not errors
+        assert all(json.get_serializer(cls).cls is cls for cls in classes)
+        assert json.loads(json.dumps(classes[10](5))).x == 5
+    finally:
+        for cls in classes:
+            json.unregister(cls)
+
+
+def test_loads_tagged():
+    import datetime
+    import serial_json as json
+
+    plain = '{"a": [1, 2, {"b": "c"}], "d": null}'
+    assert not json.is_tagged(plain)
+    assert json.loads(plain) == {'a': [1, 2, {'b': 'c'}], 'd': None}
+    assert json.loads(plain.encode('utf-8')) == {'a': [1, 2, {'b': 'c'}], 'd': None}
+
+    text = json.dumps({'date': datetime.date(2020, 1, 1)})
+    assert json.is_tagged(text) and json.is_tagged(text.encode('utf-8'))
+    assert json.loads(text) == {'date': datetime.date(2020, 1, 1)}
+    assert json.loads(text.encode('utf-8'))['date'] == datetime.date(2020, 1, 1)
+    for encoding in ('utf-8-sig', 'utf-16', 'utf-16-le', 'utf-32'):
+        assert json.is_tagged(text.encode(encoding))
+        assert json.loads(text.encode(encoding))['date'] == datetime.date(2020, 1, 1)
+        assert json.loads(plain.encode(encoding)) == {'a': [1, 2, {'b': 'c'}], 'd': None}
+    assert json.loads(json.dumps(b'abc').encode('utf-16')) == b'abc'
+
+    # Declared modes
+    assert isinstance(json.loads(text, tagged=False)['date'], dict)
+    assert json.loads(plain, tagged=True) == {'a': [1, 2, {'b': 'c'}], 'd': None}
+
+    # Keyword arguments still work without the object_hook
+    assert json.loads('[1.5]', parse_float=str) == ['1.5']
+
+    # A given object_hook is called for the untagged dicts with and without tags in the text
+    def hook(d):
+        d['hooked'] = True
+        return d
+
+    assert json.loads('{"a": 1}', object_hook=hook) == {'a': 1, 'hooked': True}
+    obj = json.loads(json.dumps({'a': {'date': datetime.date(2020, 1, 1)}}), object_hook=hook)
+    assert obj == {'a': {'date': datetime.date(2020, 1, 1), 'hooked': True}, 'hooked': True}
+
+
+def test_to_builtins():
+    import json
+    import datetime
+    import serial_json
+    from serial_json import Weekdays
+
+    value = {'date': datetime.date(2020, 1, 1), 'dt': datetime.datetime(2020, 1, 1, 12, 30),
+             'bytes': b'abc', 'days': Weekdays(['monday', 'friday']), 'tuple': (1, 'a', None),
+             'nested': [{'time': datetime.time(1, 2, 3)}, 1.5, True]}
+    plain = serial_json.to_builtins(value)
+    assert json.dumps(plain) == serial_json.dumps(value)  # No default callback needed
+    assert plain['date']['SERIALIZER_TYPE'] == 'date'
+    assert plain['tuple'] == [1, 'a', None]
+    date_plain = dict(plain['date'])
+
+    obj = serial_json.from_builtins(plain)
+    value['tuple'] = list(value['tuple'])
+    assert obj == value
+    assert plain['date'] == date_plain  # Not modified
+    assert serial_json.from_builtins(json.loads(json.dumps(plain))) == value
+
+    try:
+        serial_json.to_builtins({'a': object()})
+        raise AssertionError('Unregistered objects should raise a TypeError')
+    except TypeError:
+        pass
+
+
+def time_to_builtins(test_runs=2000):
+    import json
+    import timeit
+    import datetime
+    import serial_json
+
+    value = [{'a': i, 'date': datetime.date(2020, 1, 1), 'items': [b'abc', {'t': datetime.time(1, 2, 3)}]}
+             for i in range(10)]
+
+    t1 = timeit.timeit(lambda: serial_json.dumps(value), number=test_runs)
+    print('Serial JSON DUMPS: ', t1)
+    t2 = timeit.timeit(lambda: json.dumps(serial_json.to_builtins(value)), number=test_runs)
+    print('to_builtins + JSON DUMPS: ', t2)
+
+
+def time_dump(test_runs=20):
+    import io
+    import json
+    import timeit
+    import datetime
+    import serial_json
+
+    plain = [{'a': i, 'b': 'text {}'.format(i), 'c': [1.5, 2.5, None]} for i in range(5000)]
+    mixed = [{'a': i, 'date': datetime.date(2020, 1, 1), 'bytes': b'abc'} for i in range(5000)]
+    for name, value in (('plain', plain), ('mixed', mixed)):
+        t1 = timeit.timeit(lambda: json.dump(value, io.StringIO(), default=serial_json.default), number=test_runs)
+        print('JSON DUMP {}: '.format(name), t1)
+        t2 = timeit.timeit(lambda: serial_json.dump(value, io.StringIO()), number=test_runs)
+        print('Serial JSON DUMP {}: '.format(name), t2)
+
+
+def test_decode_construction():
+    import serial_json as json
+    from serial_json import DataClass
+
+    calls = []
+
+    class Required(object):
+        def __init__(self, x):
+            calls.append('init')
+            self.x = x
+
+        def __getstate__(self):
+            return {'x': self.x}
+
+        def __setstate__(self, state):
+            self.x = state['x']
+
+    json.register(Required)
+    try:
+        ser = json.get_serializer(Required)
+        text = json.dumps(Required(1))
+        del calls[:]
+        assert json.loads(text).x == 1
+        assert calls == []  # __init__(self) fails before running the body
+        assert ser._create is json.base_create_object
+
+        class Point(DataClass):
+            x: int
+            y: int
+            z: int = 1
+
+        assert not Point.__init_on_decode__
+        ser = json.get_serializer(Point)
+        for _ in range(3):
+            assert json.loads(json.dumps(Point(1, 2))) == Point(1, 2)
+        assert ser._create is not json.base_create_object  # Required fields skip the failing __init__
+
+        class Optional(DataClass):
+            x: int = 0
+
+        ser = json.get_serializer(Optional)
+        assert json.loads(json.dumps(Optional(5))) == Optional(5)
+        assert json.loads(json.dumps(Optional(6))) == Optional(6)
+    finally:
+        json.unregister(Required)
+
+
+def time_decode_required_fields(test_runs=20000):
+    import timeit
+    import serial_json as json
+    from serial_json import DataClass
+
+    class Required(DataClass):
+        x: int
+        y: int
+
+    class Optional(DataClass):
+        x: int = 0
+        y: int = 0
+
+    text1 = json.dumps(Required(1, 2))
+    text2 = json.dumps(Optional(1, 2))
+    print('Required fields LOADS: ', timeit.timeit(lambda: json.loads(text1), number=test_runs))
+    print('Optional fields LOADS: ', timeit.timeit(lambda: json.loads(text2), number=test_runs))
+
+
+def time_encode_threads(test_runs=2000, max_threads=8):
+    import time
+    import datetime
+    import threading
+    import serial_json as json
+
+    value = {'date': datetime.date(2020, 1, 1), 'time': datetime.time(1, 2, 3), 'bytes': b'abc' * 10,
+             'items': [{'a': i, 'b': datetime.datetime(2020, 1, 1, i % 24)} for i in range(10)]}
+
+    def run():
+        for _ in range(test_runs):
+            json.dumps(value)
+
+    nthreads = 1
+    while nthreads <= max_threads:
+        threads = [threading.Thread(target=run) for _ in range(nthreads)]
+        start = time.perf_counter()
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        elapsed = time.perf_counter() - start
+        print('Encode throughput ({} threads): {:.0f} dumps/s'.format(nthreads, nthreads * test_runs / elapsed))
+        nthreads *= 2
+
+
 if __name__ == '__main__':
     test_Message()
     test_bytes()
     test_date()
     test_time()
     test_datetime()
+    test_out_of_band_buffers()
+    test_registry_snapshot()
+    test_loads_tagged()
+    test_to_builtins()
+    test_decode_construction()
+
+    time_encode_threads()
+    time_to_builtins()
+    time_dump()
+    time_decode_required_fields()
 
     print('All tests finished successfully!')
@@ -0,0 +1,115 @@
+
+
+def test_record_store():
+    import os
+    import tempfile
+    import datetime
+    from serial_json import DataClass
+    from serial_json.store import RecordStore
+
+    class StoreRecord(DataClass):
+        id: int = 0
+        name: str = ''
+        created: datetime.date = None
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, 'records.jsonl')
+        with RecordStore(filename, auto_compact=False) as store:
+            for i in range(10):
+                store.put(StoreRecord(i, 'record {}'.format(i), datetime.date(2020, 1, i + 1)))
+            store.put(StoreRecord(3, 'updated'))
+            del store[5]
+
+            assert len(store) == 9
+            assert 5 not in store
+            assert store.get(5) is None
+            assert store[3].name == 'updated'
+            assert store[4].created == datetime.date(2020, 1, 5)
+            assert isinstance(store[4], StoreRecord)
+            assert store.obsolete == 3
+
+        # Reopen and rebuild the index
+        with RecordStore(filename) as store:
+            assert len(store) == 9
+            assert store[3].name == 'updated'
+            assert sorted(store) == [0, 1, 2, 3, 4, 6, 7, 8, 9]
+
+            size = os.path.getsize(filename)
+            store.compact()
+            assert store.obsolete == 0
+            assert os.path.getsize(filename) < size
+            assert store[3].name == 'updated'
+            assert dict((key, rec.name) for key, rec in store.items())[9] == 'record 9'
+
+        # Incomplete last line from an interrupted write
+        with open(filename, 'ab') as f:
+            f.write(b'{"id": 100, "na')
+        with RecordStore(filename) as store:
+            assert len(store) == 9
+            store.put({'id': 100, 'name': 'dict record'})
+            assert store[100] == {'id': 100, 'name': 'dict record'}
+
+
+def test_record_store_corrupt_line():
+    import os
+    import tempfile
+    import datetime
+    from serial_json.store import RecordStore
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, 'records.jsonl')
+        with RecordStore(filename) as store:
+            for i in range(3):
+                store.put({'id': i, 'date': datetime.date(2020, 1, i + 1)})
+
+        # Corrupt the date of the middle record and add a line that is not JSON
+        with open(filename, 'rb') as f:
+            lines = f.readlines()
+        lines[1] = lines[1].replace(b'2020-01-02', b'not a date')
+        lines.insert(2, b'{"id": 5, \n')
+        with open(filename, 'wb') as f:
+            f.writelines(lines)
+        size = os.path.getsize(filename)
+
+        with RecordStore(filename) as store:
+            assert os.path.getsize(filename) == size  # Complete lines are never truncated
+            assert sorted(store) == [0, 1, 2]
+            assert store[2]['date'] == datetime.date(2020, 1, 3)
+            try:
+                store[1]
+                raised = False
+            except (ValueError, Exception):
+                raised = True
+            assert raised, 'The corrupt record should raise an error when it is read'
+
+            store.put({'id': 1, 'date': datetime.date(2021, 1, 1)})
+            assert store[1]['date'] == datetime.date(2021, 1, 1)
+            assert store[2]['date'] == datetime.date(2020, 1, 3)
+
+
+def test_record_store_background_compact():
+    import os
+    import tempfile
+    from serial_json.store import RecordStore
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, 'records.jsonl')
+        with RecordStore(filename, key='key', compact_min=50) as store:
+            for i in range(2000):
+                store.put({'key': i % 20, 'value': i})
+                assert store[i % 20]['value'] == i
+
+            assert len(store) == 20
+            assert [store[key]['value'] for key in range(20)] == list(range(1980, 2000))
+
+        with RecordStore(filename, key='key') as store:
+            assert [store[key]['value'] for key in range(20)] == list(range(1980, 2000))
+            assert store.obsolete < 2000 - 20
+
+
+if __name__ == '__main__':
+    test_record_store()
+    test_record_store_corrupt_line()
+    test_record_store_background_compact()
+
+    print('All tests finished successfully!')
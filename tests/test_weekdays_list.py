@@ -104,9 +104,129 @@ def test_weekdays_append_add_remove():
     assert all(d1 == d2 for d1, d2 in zip(w3, Weekdays.DAYS))
 
 
+def test_weekdays_bits():
+    from serial_json.weekdays_list import Weekdays
+
+    w = Weekdays('sunday', 'Mon', 'fri')
+    assert w.bits == 0b0100011
+    assert int(w) == w.bits
+    assert Weekdays.from_bits(w.bits) == w
+    assert Weekdays() == Weekdays.from_bits(Weekdays.ALL_BITS)
+    assert len(w) == 3
+    assert list(w) == ['sunday', 'monday', 'friday']
+    assert w == ['sunday', 'monday', 'friday']
+    assert w[1] == 'monday'
+    assert w[-1] == 'friday'
+
+    # Set operations
+    assert (w | 'tue') == ['sunday', 'monday', 'tuesday', 'friday']
+    assert (w & Weekdays('mon', 'tue')) == ['monday']
+    assert (w - ['sun']) == ['monday', 'friday']
+    assert (['sat'] | w) == ['sunday', 'monday', 'friday', 'saturday']
+    w2 = w.copy()
+    w2 |= 'sat'
+    w2 -= 'sun'
+    assert w2 == ['monday', 'friday', 'saturday']
+    assert w == ['sunday', 'monday', 'friday']
+
+
+def test_weekdays_serialize():
+    import copy
+    import pickle
+    import serial_json
+    from serial_json.weekdays_list import Weekdays
+
+    w = Weekdays('mon', 'fri')
+    text = serial_json.dumps(w)
+    assert text == '{"SERIALIZER_OBJ": 34, "SERIALIZER_TYPE": "Weekdays"}', text
+    assert isinstance(serial_json.loads(text), Weekdays)
+    assert serial_json.loads(text) == w
+    assert serial_json.loads(serial_json.dumps({'days': [w]})) == {'days': [w]}
+    assert copy.copy(w) == w
+    assert pickle.loads(pickle.dumps(w)) == w
+
+    # Old list format
+    w2 = serial_json.loads('{"SERIALIZER_OBJ": ["monday", "friday"], "SERIALIZER_TYPE": "Weekdays"}')
+    assert isinstance(w2, Weekdays)
+    assert w2 == w
+
+    # A bitmask is not a weekday index
+    try:
+        Weekdays(34)
+        raised = False
+    except ValueError:
+        raised = True
+    assert raised, 'An integer bitmask should not silently give an empty Weekdays'
+    assert Weekdays(4) == ['friday']  # Weekday index where monday is 0
+
+
+def test_weekdays_dataclass_field():
+    import serial_json
+    from serial_json import DataClass
+    from serial_json.weekdays_list import Weekdays, weekdays_property
+
+    class Schedule(DataClass):
+        name: str = ''
+        days: Weekdays = weekdays_property('days', default=Weekdays())
+        other: Weekdays = Weekdays()
+
+    s = Schedule('work', ['mon', 'fri'], Weekdays('mon'))
+    text = serial_json.dumps(s)
+    assert '"days": 34' in text, text  # Property fields are the untagged bitmask
+    obj = serial_json.loads(text)
+    assert isinstance(obj.days, Weekdays)
+    assert obj.days == ['monday', 'friday']
+    assert isinstance(obj.other, Weekdays)  # Plain fields keep the tagged Weekdays
+    assert 'monday' in obj.other
+    assert serial_json.loads_into(Schedule(), text).days == ['monday', 'friday']
+
+    # Old data with the list of names
+    obj = serial_json.loads(text.replace('"days": 34', '"days": ["monday", "friday"]'))
+    assert obj.days == ['monday', 'friday']
+
+    # Setting an int is a weekday index like Weekdays(int)
+    s.days = 3
+    assert s.days == Weekdays(3) == ['thursday']
+    s.days = Weekdays.from_bits(34)
+    assert s.days == ['monday', 'friday']
+    s.days = 'sat'
+    assert s.days == ['saturday']
+    s.days = ['monday', 'friday']
+    assert s.days == ['monday', 'friday']
+
+
+def test_weekdays_mask_occurrences():
+    import datetime
+    from serial_json.weekdays_list import Weekdays
+
+    w = Weekdays('sun', 'mon', 'fri')
+    start = datetime.date(2020, 1, 1)
+    dates = [start + datetime.timedelta(days=i) for i in range(400)]
+    expected = [d.strftime('%A').lower() in w for d in dates]
+
+    assert [w.matches(d) for d in dates] == expected
+    assert list(w.mask(dates)) == expected
+    assert list(w.occurrences(dates[0], dates[-1])) == [d for d, valid in zip(dates, expected) if valid]
+    assert list(Weekdays([]).occurrences(dates[0], dates[-1])) == []
+
+    try:
+        import numpy as np
+    except ImportError:
+        return
+
+    arr = np.array(dates, dtype='datetime64[D]')
+    assert np.all(w.mask(arr) == expected)
+    assert np.all(w.mask(arr.astype('datetime64[s]')) == expected)
+    assert not w.mask(np.array(['NaT'], dtype='datetime64[D]'))[0]
+
+
 if __name__ == '__main__':
     test_weekdays_init()
     test_weekday_property()
     test_weekdays_append_add_remove()
+    test_weekdays_bits()
+    test_weekdays_serialize()
+    test_weekdays_dataclass_field()
+    test_weekdays_mask_occurrences()
 
     print('All tests finished successfully!')